@@ -51,6 +51,8 @@ CONF_AVG_USAGE = "avg_usage"
 
 # Scheduler
 SLOT_DURATION_MIN = 15
+# Number of cheapest windows kept per manual device ranking
+MAX_RANKED_WINDOWS = 10
 
 # Subentry types
 SUBENTRY_SOLAR_INVERTER = "solar_inverter"
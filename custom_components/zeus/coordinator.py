@@ -11,7 +11,7 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import TYPE_CHECKING, Any
 
-from homeassistant.config_entries import ConfigEntry
+from homeassistant.config_entries import ConfigEntry, ConfigSubentry
 from homeassistant.core import (
     CALLBACK_TYPE,
     Event,
@@ -47,6 +47,8 @@ from .thermal_model import ThermalTracker
 from .tibber_api import TibberApiClient, TibberApiError, TibberAuthError
 
 if TYPE_CHECKING:
+    from collections.abc import Mapping
+
     from .scheduler import ManualDeviceRanking, ScheduleResult
 
 _LOGGER = logging.getLogger(__name__)
@@ -128,7 +130,16 @@ class PriceCoordinator(DataUpdateCoordinator[dict[str, list[PriceSlot]]]):
         self.manual_device_results: dict[str, ManualDeviceRanking] = {}
         self.solar_forecast: dict[str, float] | None = None
         self._forecast_cache: dict[str, float] | None = None
+        self._forecast_cache_by_hour: dict[datetime, float] | None = None
         self._forecast_cache_time: datetime | None = None
+        # Scheduler settings parsed from each device subentry, kept with the
+        # subentry data they were parsed from so a reconfigure reparses them
+        self.subentry_settings: dict[str, tuple[Mapping[str, Any], dict[str, Any]]] = {}
+        # Subentries partitioned by type, kept with the subentries mapping
+        # they were partitioned from
+        self.subentries_by_type: (
+            tuple[Mapping[str, Any], dict[str, tuple[ConfigSubentry, ...]]] | None
+        ) = None
 
     def _get_tibber_client(self) -> TibberApiClient:
         """Get or create the Tibber API client."""
@@ -652,19 +663,39 @@ class PriceCoordinator(DataUpdateCoordinator[dict[str, list[PriceSlot]]]):
         slot = self.get_next_slot()
         return slot.price if slot else None
 
+    def _is_forecast_cache_fresh(self) -> bool:
+        """Return True if the cached forecast is within its TTL."""
+        return (
+            self._forecast_cache_time is not None
+            and dt_util.utcnow() - self._forecast_cache_time < FORECAST_CACHE_TTL
+        )
+
     def get_cached_forecast(self) -> dict[str, float] | None:
         """Return cached forecast if still valid, else None."""
-        if (
-            self._forecast_cache is not None
-            and self._forecast_cache_time is not None
-            and dt_util.utcnow() - self._forecast_cache_time < FORECAST_CACHE_TTL
-        ):
+        if self._forecast_cache is not None and self._is_forecast_cache_fresh():
             return self._forecast_cache
         return None
 
-    def set_cached_forecast(self, forecast: dict[str, float]) -> None:
-        """Store a fresh forecast in the cache."""
+    def get_cached_slot_solar(self) -> dict[datetime, float] | None:
+        """Return the cached forecast keyed by hour start, if still valid."""
+        if self._forecast_cache_by_hour is not None and self._is_forecast_cache_fresh():
+            return self._forecast_cache_by_hour
+        return None
+
+    def set_cached_forecast(
+        self,
+        forecast: dict[str, float],
+        forecast_by_hour: dict[datetime, float] | None = None,
+    ) -> None:
+        """
+        Store a fresh forecast in the cache.
+
+        ``forecast_by_hour`` is the same forecast keyed by hour-start
+        datetimes, kept alongside so the scheduler can skip re-parsing the
+        ISO keys on every tick.
+        """
         self._forecast_cache = forecast
+        self._forecast_cache_by_hour = forecast_by_hour
         self._forecast_cache_time = dt_util.utcnow()
 
     def _has_managed_devices(self) -> bool:
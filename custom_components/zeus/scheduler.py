@@ -2,14 +2,23 @@
 
 from __future__ import annotations
 
+import asyncio
 import contextlib
+import heapq
 import logging
 import math
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass, field
 from datetime import datetime, time, timedelta
+from functools import lru_cache
+from itertools import accumulate
+from operator import attrgetter
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping
+
+    from homeassistant.config_entries import ConfigSubentry
     from homeassistant.helpers.entity_registry import EntityRegistry
 
 from homeassistant.components.recorder import history
@@ -40,6 +49,8 @@ from .const import (
     CONF_TEMPERATURE_SENSOR,
     CONF_TEMPERATURE_TOLERANCE,
     CONF_USE_ACTUAL_POWER,
+    DOMAIN,
+    MAX_RANKED_WINDOWS,
     SLOT_DURATION_MIN,
     SUBENTRY_HOME_MONITOR,
     SUBENTRY_MANUAL_DEVICE,
@@ -60,8 +71,31 @@ _LOGGER = logging.getLogger(__name__)
 # Minimum number of time parts when parsing a deadline string (HH:MM:SS)
 _TIME_PARTS_WITH_SECONDS = 3
 
+# Sensor states that carry no reading
+_UNAVAILABLE_STATES = frozenset(("unknown", "unavailable"))
+
+# Length of one price slot
+_SLOT_DURATION = timedelta(minutes=SLOT_DURATION_MIN)
+
+
+@dataclass(slots=True)
+class _EntryIndex:
+    """
+    Config entry entities resolved for one scheduling cycle.
+
+    Holds the entity IDs resolved from the home monitor, solar inverter and
+    thermostat subentries.
+    """
+
+    home_monitor_entities: tuple[str, ...]
+    production_entities: tuple[str, ...]
+    # (switch_entity, power_sensor) of each fully configured thermostat
+    thermostat_entities: tuple[tuple[str, str], ...]
+    # Every entity whose state the thermostat/home/solar lookups read
+    state_entity_ids: frozenset[str]
+
 
-@dataclass
+@dataclass(slots=True)
 class DeviceScheduleRequest:
     """A device requesting scheduled runtime."""
 
@@ -114,7 +148,7 @@ class DeviceScheduleRequest:
         return math.ceil(self.remaining_runtime_min / SLOT_DURATION_MIN)
 
 
-@dataclass
+@dataclass(slots=True)
 class ScheduleResult:
     """The result of scheduling for one device."""
 
@@ -125,7 +159,7 @@ class ScheduleResult:
     reason: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class ThermostatScheduleRequest:
     """A thermostat device requesting temperature-managed scheduling."""
 
@@ -184,19 +218,25 @@ class ThermostatScheduleRequest:
 
 def _get_state_changes(
     hass: HomeAssistant,
-    entity_id: str,
+    entity_ids: list[str],
     start: datetime,
     end: datetime,
-) -> list[State]:
-    """Fetch state changes from recorder DB. BLOCKING -- run in executor."""
-    return history.state_changes_during_period(
+) -> dict[str, list[State]]:
+    """
+    Fetch state changes for several entities from recorder DB.
+
+    BLOCKING -- run in executor.  All entities are read with a single
+    query; for non-significant domains such as switches only rows where
+    the state itself changed are returned.
+    """
+    return history.get_significant_states(
         hass,
         start,
         end,
-        entity_id,
+        entity_ids,
         include_start_time_state=True,
         no_attributes=True,
-    ).get(entity_id, [])
+    )
 
 
 def _compute_on_seconds(
@@ -205,28 +245,31 @@ def _compute_on_seconds(
     end_ts: float,
     now_ts: float,
 ) -> float:
-    """Compute total seconds the entity spent in 'on' state."""
-    previous_matches = False
-    last_change_ts = 0.0
-    elapsed = 0.0
-
-    for state in states:
-        matches = state.state == "on"
-        change_ts = state.last_changed_timestamp
-
-        if math.floor(change_ts) > end_ts:
-            break
-        if math.floor(change_ts) > now_ts:
-            break
-
-        if previous_matches:
-            elapsed += change_ts - last_change_ts
-
-        previous_matches = matches
-        last_change_ts = max(start_ts, change_ts)
+    """
+    Compute total seconds the entity spent in 'on' state.
 
-    if previous_matches:
-        elapsed += min(end_ts, now_ts) - last_change_ts
+    Timestamps and on-flags are extracted once, the list is cut at the
+    first change past the window, and the on-intervals are summed pairwise
+    instead of walking the ``State`` objects with per-row attribute access.
+    """
+    window_end_ts = min(end_ts, now_ts)
+    timestamps = [state.last_changed_timestamp for state in states]
+    cutoff = bisect_right(timestamps, window_end_ts)
+    if cutoff == 0:
+        return 0.0
+    timestamps = timestamps[:cutoff]
+    is_on = [state.state == "on" for state in states[:cutoff]]
+    clipped = [max(start_ts, ts) for ts in timestamps]
+
+    elapsed = sum(
+        change_ts - last_change_ts
+        for change_ts, last_change_ts, was_on in zip(
+            timestamps[1:], clipped, is_on, strict=False
+        )
+        if was_on
+    )
+    if is_on[-1]:
+        elapsed += window_end_ts - clipped[-1]
 
     return elapsed
 
@@ -236,6 +279,24 @@ async def async_get_runtime_today_minutes(
     entity_id: str,
 ) -> float:
     """Get how many minutes a switch entity has been 'on' today."""
+    runtimes = await async_get_runtimes_today_minutes(
+        hass, {entity_id: hass.states.get(entity_id)}, [entity_id]
+    )
+    return runtimes[entity_id]
+
+
+async def async_get_runtimes_today_minutes(
+    hass: HomeAssistant,
+    states: Mapping[str, State | None],
+    entity_ids: list[str],
+) -> dict[str, float]:
+    """
+    Get how many minutes each switch entity has been 'on' today.
+
+    When an entity has not changed state since midnight its runtime
+    follows from its state in ``states`` alone.  The remaining entities are
+    fetched from the recorder together in one executor job.
+    """
     now = dt_util.now()
     today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
 
@@ -247,24 +308,42 @@ async def async_get_runtime_today_minutes(
         instance = get_instance(hass)
     except KeyError:
         _LOGGER.debug("Recorder not available, assuming 0 runtime")
-        return 0.0
+        return dict.fromkeys(entity_ids, 0.0)
+
+    runtimes: dict[str, float] = {}
+    changed_today: list[str] = []
+    for entity_id in dict.fromkeys(entity_ids):
+        state = states.get(entity_id)
+        if state is None or state.last_changed >= start_utc:
+            changed_today.append(entity_id)
+        elif state.state == "on":
+            runtimes[entity_id] = (end_utc - start_utc).total_seconds() / 60.0
+        else:
+            runtimes[entity_id] = 0.0
 
-    states = await instance.async_add_executor_job(
-        _get_state_changes, hass, entity_id, start_utc, end_utc
+    if not changed_today:
+        return runtimes
+
+    changes = await instance.async_add_executor_job(
+        _get_state_changes, hass, changed_today, start_utc, end_utc
     )
 
     now_ts = dt_util.utcnow().timestamp()
-    start_ts = math.floor(start_utc.timestamp())
-    end_ts = math.floor(end_utc.timestamp())
+    start_ts = start_utc.timestamp()
+    end_ts = end_utc.timestamp()
 
-    seconds = _compute_on_seconds(states, start_ts, end_ts, now_ts)
-    return seconds / 60.0
+    for entity_id in changed_today:
+        seconds = _compute_on_seconds(
+            changes.get(entity_id, []), start_ts, end_ts, now_ts
+        )
+        runtimes[entity_id] = seconds / 60.0
+    return runtimes
 
 
 async def async_get_solar_forecast(
     hass: HomeAssistant,
     entry: ConfigEntry,
-    coordinator: PriceCoordinator | None = None,
+    coordinator: PriceCoordinator,
 ) -> dict[str, float] | None:
     """
     Get hourly solar forecast from Forecast.Solar API.
@@ -273,18 +352,15 @@ async def async_get_solar_forecast(
     the Forecast.Solar free-tier rate limit (12 requests/hour).
     """
     # Return cached forecast if available and fresh
-    if coordinator is not None:
-        cached = coordinator.get_cached_forecast()
-        if cached is not None:
-            return cached
+    cached = coordinator.get_cached_forecast()
+    if cached is not None:
+        return cached
 
     # Collect solar plane configs from all solar_inverter subentries
     planes: list[SolarPlaneConfig] = []
     api_key: str | None = None
 
-    for subentry in entry.subentries.values():
-        if subentry.subentry_type != SUBENTRY_SOLAR_INVERTER:
-            continue
+    for subentry in _subentries_of_type(entry, coordinator, SUBENTRY_SOLAR_INVERTER):
         data = subentry.data
         dec = data.get(CONF_SOLAR_DECLINATION)
         az = data.get(CONF_SOLAR_AZIMUTH)
@@ -334,59 +410,187 @@ async def async_get_solar_forecast(
     # {iso_string: wh_per_hour}. The new API gives us watts (avg power
     # per period). We group by hour and average the watts, which equals
     # the Wh for that hour.
-    wh_hours: dict[str, float] = {}
-    hourly_watts: dict[str, list[float]] = {}
-
+    hourly_totals: dict[datetime, tuple[float, int]] = {}
     for dt_key, watts in result.watts.items():
         # Group by the start of each hour
         hour_start = dt_key.replace(minute=0, second=0, microsecond=0)
-        iso_key = hour_start.isoformat()
-        hourly_watts.setdefault(iso_key, []).append(watts)
+        total, count = hourly_totals.get(hour_start, (0.0, 0))
+        hourly_totals[hour_start] = (total + watts, count + 1)
 
-    for iso_key, watt_list in hourly_watts.items():
-        # Average watts over the hour = Wh for that hour
-        wh_hours[iso_key] = sum(watt_list) / len(watt_list)
+    # Average watts over the hour = Wh for that hour
+    solar_by_hour = {
+        hour_start: total / count
+        for hour_start, (total, count) in hourly_totals.items()
+    }
+    wh_hours = {hour_start.isoformat(): wh for hour_start, wh in solar_by_hour.items()}
 
-    # Cache the result on the coordinator
-    if coordinator is not None:
-        coordinator.set_cached_forecast(wh_hours)
+    # Cache the result on the coordinator, together with the parsed lookup
+    # so _build_slot_info does not re-parse the ISO keys every tick.
+    coordinator.set_cached_forecast(wh_hours, solar_by_hour)
 
     return wh_hours
 
 
+def _get_parsed_subentry_data(
+    coordinator: PriceCoordinator,
+    subentry: ConfigSubentry,
+    parse: Callable[[Mapping[str, Any]], dict[str, Any]],
+) -> dict[str, Any]:
+    """
+    Return the parsed settings of a subentry, parsing only on change.
+
+    Parsed settings are kept on the coordinator, so they are dropped with
+    it when the entry unloads.  Subentry data is replaced (not mutated) on
+    reconfigure, so a cached result is only reused while it was parsed from
+    the identical data mapping.
+    """
+    cached = coordinator.subentry_settings.get(subentry.subentry_id)
+    if cached is not None and cached[0] is subentry.data:
+        return cached[1]
+    parsed = parse(subentry.data)
+    coordinator.subentry_settings[subentry.subentry_id] = (subentry.data, parsed)
+    return parsed
+
+
+def _subentries_of_type(
+    entry: ConfigEntry,
+    coordinator: PriceCoordinator,
+    subentry_type: str,
+) -> tuple[ConfigSubentry, ...]:
+    """
+    Return the subentries of one type, in configuration order.
+
+    The partition by type is kept on the coordinator.  Adding, removing or
+    reconfiguring a subentry replaces the entry's subentries mapping, so
+    the partition is only reused while it was built from the identical
+    mapping.
+    """
+    cached = coordinator.subentries_by_type
+    if cached is None or cached[0] is not entry.subentries:
+        by_type: dict[str, list[ConfigSubentry]] = {}
+        for subentry in entry.subentries.values():
+            by_type.setdefault(subentry.subentry_type, []).append(subentry)
+        cached = (
+            entry.subentries,
+            {
+                subentry_type: tuple(subentries)
+                for subentry_type, subentries in by_type.items()
+            },
+        )
+        coordinator.subentries_by_type = cached
+    return cached[1].get(subentry_type, ())
+
+
+def _build_entry_index(
+    entry: ConfigEntry,
+    coordinator: PriceCoordinator,
+) -> _EntryIndex:
+    """
+    Resolve the home monitor, solar and thermostat entities of an entry.
+
+    Built once per scheduling cycle from the coordinator's subentry
+    partition, so only the three relevant buckets are read.
+    """
+    thermostat_entities: list[tuple[str, str]] = []
+    state_entity_ids: set[str] = set()
+    for subentry in _subentries_of_type(entry, coordinator, SUBENTRY_THERMOSTAT_DEVICE):
+        data = subentry.data
+        switch_entity = data.get(CONF_SWITCH_ENTITY)
+        power_sensor = data.get(CONF_POWER_SENSOR)
+        if switch_entity and power_sensor:
+            thermostat_entities.append((switch_entity, power_sensor))
+        state_entity_ids.update(
+            data[key]
+            for key in (CONF_SWITCH_ENTITY, CONF_POWER_SENSOR, CONF_TEMPERATURE_SENSOR)
+            if data.get(key)
+        )
+    home_monitor_entities = tuple(
+        subentry.data[CONF_ENERGY_USAGE_ENTITY]
+        for subentry in _subentries_of_type(entry, coordinator, SUBENTRY_HOME_MONITOR)
+        if subentry.data.get(CONF_ENERGY_USAGE_ENTITY)
+    )
+    production_entities = tuple(
+        subentry.data[CONF_PRODUCTION_ENTITY]
+        for subentry in _subentries_of_type(entry, coordinator, SUBENTRY_SOLAR_INVERTER)
+        if subentry.data.get(CONF_PRODUCTION_ENTITY)
+    )
+    state_entity_ids.update(home_monitor_entities)
+    state_entity_ids.update(production_entities)
+    return _EntryIndex(
+        home_monitor_entities=home_monitor_entities,
+        production_entities=production_entities,
+        thermostat_entities=tuple(thermostat_entities),
+        state_entity_ids=frozenset(state_entity_ids),
+    )
+
+
+def _parse_switch_device_data(data: Mapping[str, Any]) -> dict[str, Any]:
+    """Parse switch device subentry data into schedule request fields."""
+    deadline_str = data.get(CONF_DEADLINE, "23:00:00")
+    # Parse "HH:MM:SS" string to time object
+    parts = str(deadline_str).split(":")
+    deadline_time = time(
+        hour=int(parts[0]),
+        minute=int(parts[1]) if len(parts) > 1 else 0,
+        second=int(parts[2]) if len(parts) >= _TIME_PARTS_WITH_SECONDS else 0,
+    )
+    return {
+        "switch_entity": data[CONF_SWITCH_ENTITY],
+        "power_sensor": data[CONF_POWER_SENSOR],
+        "peak_usage_w": float(data[CONF_PEAK_USAGE]),
+        "daily_runtime_min": float(data[CONF_DAILY_RUNTIME]),
+        "deadline": deadline_time,
+        "priority": int(data.get(CONF_PRIORITY, 5)),
+        "min_cycle_time_min": float(data.get(CONF_MIN_CYCLE_TIME, 0)),
+        "use_actual_power": bool(data.get(CONF_USE_ACTUAL_POWER, False)),
+    }
+
+
+def _parse_thermostat_device_data(data: Mapping[str, Any]) -> dict[str, Any]:
+    """Parse thermostat device subentry data into schedule request fields."""
+    return {
+        "tolerance": float(data.get(CONF_TEMPERATURE_TOLERANCE, 1.5)),
+        "peak_usage_w": float(data[CONF_PEAK_USAGE]),
+        "switch_entity": data[CONF_SWITCH_ENTITY],
+        "power_sensor": data[CONF_POWER_SENSOR],
+        "temperature_sensor": data[CONF_TEMPERATURE_SENSOR],
+        "priority": int(data.get(CONF_PRIORITY, 5)),
+        "min_cycle_time_min": float(data.get(CONF_MIN_CYCLE_TIME, 5)),
+    }
+
+
 def _build_device_requests(
     entry: ConfigEntry,
+    coordinator: PriceCoordinator,
 ) -> list[DeviceScheduleRequest]:
     """Build schedule requests from switch device subentries."""
-    requests = []
-    for subentry in entry.subentries.values():
-        if subentry.subentry_type != SUBENTRY_SWITCH_DEVICE:
-            continue
-        data = subentry.data
-        deadline_str = data.get(CONF_DEADLINE, "23:00:00")
-        # Parse "HH:MM:SS" string to time object
-        parts = str(deadline_str).split(":")
-        deadline_time = time(
-            hour=int(parts[0]),
-            minute=int(parts[1]) if len(parts) > 1 else 0,
-            second=int(parts[2]) if len(parts) >= _TIME_PARTS_WITH_SECONDS else 0,
+    return [
+        DeviceScheduleRequest(
+            subentry_id=subentry.subentry_id,
+            name=subentry.title,
+            **_get_parsed_subentry_data(
+                coordinator, subentry, _parse_switch_device_data
+            ),
         )
+        for subentry in _subentries_of_type(entry, coordinator, SUBENTRY_SWITCH_DEVICE)
+    ]
 
-        requests.append(
-            DeviceScheduleRequest(
-                subentry_id=subentry.subentry_id,
-                name=subentry.title,
-                switch_entity=data[CONF_SWITCH_ENTITY],
-                power_sensor=data[CONF_POWER_SENSOR],
-                peak_usage_w=float(data[CONF_PEAK_USAGE]),
-                daily_runtime_min=float(data[CONF_DAILY_RUNTIME]),
-                deadline=deadline_time,
-                priority=int(data.get(CONF_PRIORITY, 5)),
-                min_cycle_time_min=float(data.get(CONF_MIN_CYCLE_TIME, 0)),
-                use_actual_power=bool(data.get(CONF_USE_ACTUAL_POWER, False)),
-            )
+
+async def _async_get_learned_power_or_none(
+    hass: HomeAssistant,
+    name: str,
+    power_sensor: str,
+    switch_entity: str,
+) -> float | None:
+    """Query learned average power from the recorder, or None on failure."""
+    try:
+        raw_learned, _on_hours = await async_get_learned_avg_power_w(
+            hass, power_sensor, switch_entity
         )
-    return requests
+    except Exception:  # noqa: BLE001
+        _LOGGER.debug("Failed to get learned power for %s", name, exc_info=True)
+        return None
+    return raw_learned
 
 
 async def _async_build_thermostat_requests(
@@ -400,18 +604,45 @@ async def _async_build_thermostat_requests(
     Reads the target temperature from the associated climate entity and
     the tolerance from the subentry config to compute the heating bounds.
     Populates learned power and thermal data from the coordinator's
-    thermal trackers and the recorder.
+    thermal trackers and the recorder.  The recorder queries for all
+    thermostats run concurrently.
     """
-    requests = []
-    for subentry in entry.subentries.values():
-        if subentry.subentry_type != SUBENTRY_THERMOSTAT_DEVICE:
-            continue
-        data = subentry.data
+    thermostat_subentries = [
+        (
+            subentry,
+            _get_parsed_subentry_data(
+                coordinator, subentry, _parse_thermostat_device_data
+            ),
+        )
+        for subentry in _subentries_of_type(
+            entry, coordinator, SUBENTRY_THERMOSTAT_DEVICE
+        )
+    ]
+    if not thermostat_subentries:
+        return []
+
+    ent_reg = er.async_get(hass)
 
-        tolerance = float(data.get(CONF_TEMPERATURE_TOLERANCE, 1.5))
+    # Query learned average power from the recorder
+    learned_powers = await asyncio.gather(
+        *(
+            _async_get_learned_power_or_none(
+                hass, subentry.title, params["power_sensor"], params["switch_entity"]
+            )
+            for subentry, params in thermostat_subentries
+        )
+    )
+
+    requests = []
+    for (subentry, params), raw_learned in zip(
+        thermostat_subentries, learned_powers, strict=True
+    ):
+        tolerance = params["tolerance"]
 
         # Look up the climate entity for this subentry to get the target temp
-        climate_entity_id = _find_climate_entity(hass, entry, subentry.subentry_id)
+        climate_entity_id = ent_reg.async_get_entity_id(
+            "climate", DOMAIN, f"{entry.entry_id}_{subentry.subentry_id}_climate"
+        )
         target_temp = 20.0  # default
         hvac_mode = "heat"
 
@@ -424,24 +655,11 @@ async def _async_build_thermostat_requests(
                     with contextlib.suppress(ValueError, TypeError):
                         target_temp = float(attrs["temperature"])
 
-        # Query learned average power from the recorder
-        peak_w = float(data[CONF_PEAK_USAGE])
-        switch_entity = data[CONF_SWITCH_ENTITY]
-        power_sensor = data[CONF_POWER_SENSOR]
+        peak_w = params["peak_usage_w"]
 
         learned_avg_power_w: float | None = None
         wh_per_degree: float | None = None
 
-        try:
-            raw_learned, _on_hours = await async_get_learned_avg_power_w(
-                hass, power_sensor, switch_entity
-            )
-        except Exception:  # noqa: BLE001
-            _LOGGER.debug(
-                "Failed to get learned power for %s", subentry.title, exc_info=True
-            )
-            raw_learned = None
-
         # Get thermal tracker data from coordinator
         tracker = coordinator.get_thermal_tracker(subentry.subentry_id)
         sample_count = tracker.sample_count if tracker else 0
@@ -456,14 +674,14 @@ async def _async_build_thermostat_requests(
             ThermostatScheduleRequest(
                 subentry_id=subentry.subentry_id,
                 name=subentry.title,
-                switch_entity=switch_entity,
-                power_sensor=power_sensor,
-                temperature_sensor=data[CONF_TEMPERATURE_SENSOR],
+                switch_entity=params["switch_entity"],
+                power_sensor=params["power_sensor"],
+                temperature_sensor=params["temperature_sensor"],
                 peak_usage_w=peak_w,
                 target_temp_low=target_temp - tolerance,
                 target_temp_high=target_temp + tolerance,
-                priority=int(data.get(CONF_PRIORITY, 5)),
-                min_cycle_time_min=float(data.get(CONF_MIN_CYCLE_TIME, 5)),
+                priority=params["priority"],
+                min_cycle_time_min=params["min_cycle_time_min"],
                 hvac_mode=hvac_mode,
                 learned_avg_power_w=learned_avg_power_w,
                 wh_per_degree=wh_per_degree,
@@ -472,22 +690,7 @@ async def _async_build_thermostat_requests(
     return requests
 
 
-def _find_climate_entity(
-    hass: HomeAssistant,
-    entry: ConfigEntry,
-    subentry_id: str,
-) -> str | None:
-    """Find the Zeus climate entity ID for a thermostat subentry."""
-    ent_reg = er.async_get(hass)
-    expected_unique_id = f"{entry.entry_id}_{subentry_id}_climate"
-
-    for ent_entry in ent_reg.entities.get_entries_for_config_entry_id(entry.entry_id):
-        if ent_entry.unique_id == expected_unique_id:
-            return ent_entry.entity_id
-    return None
-
-
-@dataclass
+@dataclass(slots=True)
 class _SlotInfo:
     """Pre-computed information for a single time slot."""
 
@@ -499,17 +702,76 @@ class _SlotInfo:
     remaining_solar_w: float  # Surplus still available after device assignments
 
 
-def _build_slot_info(
+class _SlotTable(dict[datetime, _SlotInfo]):
+    """
+    Slot info keyed chronologically by slot start.
+
+    ``starts`` and ``slots`` hold the keys and values in the same order, so
+    callers bisect and slice them instead of re-listing the mapping.  Once
+    built, slots are only updated in place and never added or removed.
+    """
+
+    __slots__ = ("slots", "starts")
+
+    def __init__(self, info: dict[datetime, _SlotInfo]) -> None:
+        """Index ``info``, which must be keyed in chronological order."""
+        super().__init__(info)
+        self.starts = list(info)
+        self.slots = list(info.values())
+
+
+def _ordered_slots(
+    slot_info: dict[datetime, _SlotInfo],
+) -> tuple[list[datetime], list[_SlotInfo]]:
+    """Return the chronological slot starts and slots of ``slot_info``."""
+    if isinstance(slot_info, _SlotTable):
+        return slot_info.starts, slot_info.slots
+    return list(slot_info), list(slot_info.values())
+
+
+def _parse_solar_forecast(
+    solar_forecast: dict[str, Any] | None,
+) -> dict[datetime, float]:
+    """
+    Parse an ``{iso_string: wh}`` forecast into a lookup keyed by hour start.
+
+    Keys are normalised to the start of their hour so a slot can find its
+    forecast with a single dict lookup.  Keys are produced by
+    ``datetime.isoformat`` so the C ``fromisoformat`` parser is used;
+    offset-less keys are taken as local time and unparseable entries are
+    skipped.
+    """
+    solar_by_hour: dict[datetime, float] = {}
+    if not solar_forecast:
+        return solar_by_hour
+    for iso_str, wh_value in solar_forecast.items():
+        try:
+            forecast_dt = datetime.fromisoformat(iso_str)
+            if forecast_dt.tzinfo is None:
+                # Naive keys would never match the tz-aware slot starts.
+                forecast_dt = dt_util.as_local(forecast_dt)
+            hour_start = forecast_dt.replace(minute=0, second=0, microsecond=0)
+            solar_by_hour[hour_start] = float(wh_value)
+        except (ValueError, TypeError):
+            continue
+    return solar_by_hour
+
+
+def _build_slot_info(  # noqa: PLR0913
     price_slots: list[PriceSlot],
     solar_forecast: dict[str, Any] | None,
     home_consumption_w: float,
     now: datetime,
     live_solar_surplus_w: float | None = None,
-) -> dict[datetime, _SlotInfo]:
+    solar_by_hour: dict[datetime, float] | None = None,
+    current_slot_start: datetime | None = None,
+) -> _SlotTable:
     """
     Build pre-computed slot info for all future slots.
 
-    This is computed once and shared across all devices. The
+    This is computed once and shared across all devices.  ``price_slots``
+    must be in chronological order (as provided by the coordinator) so the
+    returned mapping is keyed chronologically.  The
     ``remaining_solar_w`` field starts equal to ``solar_surplus_w`` and is
     decremented as devices are assigned to slots, so that multiple devices
     sharing a slot correctly split the available solar.
@@ -518,45 +780,33 @@ def _build_slot_info(
     replaces the forecast surplus when it is higher, so that devices can
     be opportunistically activated when real production exceeds the
     forecast.
+
+    ``solar_by_hour`` is an already-parsed forecast keyed by hour start
+    (see ``PriceCoordinator.get_cached_slot_solar``); when given,
+    ``solar_forecast`` is not parsed.
     """
-    # Pre-parse the solar forecast into a {hour_dt: wh} lookup for O(1) access
-    solar_by_hour: dict[tuple[int, int, int, int], float] = {}
-    if solar_forecast:
-        for iso_str, wh_value in solar_forecast.items():
-            try:
-                forecast_dt = dt_util.parse_datetime(iso_str)
-                if forecast_dt is None:
-                    continue
-                key = (
-                    forecast_dt.date().year,
-                    forecast_dt.date().month,
-                    forecast_dt.date().day,
-                    forecast_dt.hour,
-                )
-                solar_by_hour[key] = float(wh_value)
-            except (ValueError, TypeError):
-                continue
+    # Skip slots that have already ended: start + duration <= now
+    first_future = bisect_right(
+        price_slots,
+        now - _SLOT_DURATION,
+        key=attrgetter("start_time"),
+    )
 
-    info: dict[datetime, _SlotInfo] = {}
-    for slot in price_slots:
-        slot_end = slot.start_time + timedelta(minutes=SLOT_DURATION_MIN)
-        if slot_end <= now:
-            continue
+    if first_future == len(price_slots):
+        return _SlotTable({})
+
+    if solar_by_hour is None:
+        solar_by_hour = _parse_solar_forecast(solar_forecast)
 
+    info: dict[datetime, _SlotInfo] = {}
+    for slot in price_slots[first_future:]:
         price = slot.price if slot.price is not None else 0.0
         energy_price = slot.energy_price if slot.energy_price is not None else 0.0
 
-        # Look up solar production for this slot's hour
-        solar_production_w = 0.0
-        hour_key = (
-            slot.start_time.year,
-            slot.start_time.month,
-            slot.start_time.day,
-            slot.start_time.hour,
-        )
-        if hour_key in solar_by_hour:
-            # Wh per hour ≈ average W for that hour
-            solar_production_w = solar_by_hour[hour_key]
+        # Look up solar production for this slot's hour.
+        # Wh per hour ≈ average W for that hour.
+        hour_start = slot.start_time.replace(minute=0, second=0, microsecond=0)
+        solar_production_w = solar_by_hour.get(hour_start, 0.0)
 
         solar_surplus_w = max(0.0, solar_production_w - home_consumption_w)
 
@@ -569,16 +819,20 @@ def _build_slot_info(
             remaining_solar_w=solar_surplus_w,
         )
 
+    table = _SlotTable(info)
+
     # Override current slot with live solar surplus when it exceeds forecast.
-    _apply_live_solar_override(info, live_solar_surplus_w, now)
+    if current_slot_start is None:
+        current_slot_start = _get_current_slot_start(now)
+    _apply_live_solar_override(table, live_solar_surplus_w, current_slot_start)
 
-    return info
+    return table
 
 
 def _apply_live_solar_override(
-    info: dict[datetime, _SlotInfo],
+    info: _SlotTable,
     live_solar_surplus_w: float | None,
-    now: datetime,
+    current_slot_start: datetime,
 ) -> None:
     """
     Apply live solar surplus to the current slot and correct future forecasts.
@@ -590,7 +844,6 @@ def _apply_live_solar_override(
     if live_solar_surplus_w is None:
         return
 
-    current_slot_start = _get_current_slot_start(now)
     if current_slot_start not in info:
         return
 
@@ -615,8 +868,11 @@ def _apply_live_solar_override(
                 "Applying forecast bias correction: %.2fx to future slots",
                 bias,
             )
-            for st, s in info.items():
-                if st > current_slot_start and s.solar_surplus_w > 0:
+            # Slots are keyed chronologically, so the future ones follow the
+            # current slot's position.
+            first = bisect_right(info.starts, current_slot_start)
+            for s in info.slots[first:]:
+                if s.solar_surplus_w > 0:
                     adjusted = s.solar_surplus_w * bias
                     s.solar_surplus_w = adjusted
                     s.remaining_solar_w = adjusted
@@ -649,32 +905,36 @@ def _cost_for_device_in_slot(
 
     """
     feed_in = slot.energy_price  # spot price = what you earn for export
+    remaining_solar_w = slot.remaining_solar_w
 
-    if slot.remaining_solar_w >= device_peak_w:
+    if remaining_solar_w >= device_peak_w:
         # Solar fully covers this device.
         # Opportunity cost: we lose the feed-in revenue for this power.
-        if feed_in > 0:
-            return -feed_in
-        return -1.0
+        return -feed_in if feed_in > 0 else -1.0
 
-    if slot.remaining_solar_w > 0:
-        solar_fraction = slot.remaining_solar_w / device_peak_w
-        grid_cost = slot.price * (1.0 - solar_fraction)
-        # Subtract opportunity cost of the solar portion we consume
-        if feed_in > 0:
-            opportunity_cost = feed_in * solar_fraction
-            return grid_cost - opportunity_cost
-        return grid_cost
+    if remaining_solar_w <= 0:
+        return slot.price
 
-    return slot.price
+    solar_fraction = remaining_solar_w / device_peak_w
+    grid_cost = slot.price * (1.0 - solar_fraction)
+    # Subtract opportunity cost of the solar portion we consume
+    if feed_in > 0:
+        return grid_cost - feed_in * solar_fraction
+    return grid_cost
 
 
 def _get_eligible_slots(
-    slot_info: dict[datetime, _SlotInfo],
+    slot_starts: list[datetime],
     now: datetime,
     deadline: time,
 ) -> list[datetime]:
-    """Return slot start times between *now* and *deadline*, chronologically."""
+    """
+    Return slot start times between *now* and *deadline*, chronologically.
+
+    ``slot_starts`` are the chronologically ordered keys of ``slot_info``
+    (built from the coordinator's sorted price slots), so the deadline cut
+    is a bisection rather than a filter-and-sort.
+    """
     deadline_dt = now.replace(
         hour=deadline.hour,
         minute=deadline.minute,
@@ -684,28 +944,29 @@ def _get_eligible_slots(
     if deadline_dt <= now:
         return []
 
-    return sorted(st for st, s in slot_info.items() if s.start_time < deadline_dt)
+    return slot_starts[: bisect_left(slot_starts, deadline_dt)]
 
 
-@dataclass
+@dataclass(slots=True)
 class _DeviceState:
     """Mutable bookkeeping for a device during scheduling."""
 
     remaining_needed: int
+    current_slot_usage_w: float  # effective_usage_w, snapshotted for the run
     assigned_slots: list[datetime] = field(default_factory=list)
+    assigned_set: set[datetime] = field(default_factory=set)
     forced_on: bool = False
 
 
 def _apply_deadline_forced(
     active_devices: list[DeviceScheduleRequest],
+    eligible_by_device: list[list[datetime]],
     states: dict[str, _DeviceState],
     slot_info: dict[datetime, _SlotInfo],
-    now: datetime,
     current_slot_start: datetime,
 ) -> None:
     """Phase 1: Force-assign all eligible slots for deadline-pressured devices."""
-    for device in active_devices:
-        eligible = _get_eligible_slots(slot_info, now, device.deadline)
+    for device, eligible in zip(active_devices, eligible_by_device, strict=True):
         if not eligible:
             continue
 
@@ -713,22 +974,24 @@ def _apply_deadline_forced(
         if state.remaining_needed < len(eligible):
             continue
 
-        # Must use ALL eligible slots — no room to skip any
+        # Must use ALL eligible slots — no room to skip any.  The device
+        # holds no slots yet, so every eligible slot is assigned as is.
         state.forced_on = True
+        state.assigned_slots.extend(eligible)
+        state.assigned_set.update(eligible)
+        state.remaining_needed -= len(eligible)
         for st in eligible:
-            if st not in state.assigned_slots:
-                state.assigned_slots.append(st)
-                state.remaining_needed = max(0, state.remaining_needed - 1)
-                # Consume solar — use actual draw for current slot
-                consumption = _solar_consumption_for_device(
-                    device, st, current_slot_start
-                )
-                info = slot_info[st]
-                info.remaining_solar_w = max(0.0, info.remaining_solar_w - consumption)
+            # Consume solar — use actual draw for current slot
+            consumption = _solar_consumption_for_device(
+                device, state, st, current_slot_start
+            )
+            info = slot_info[st]
+            info.remaining_solar_w = max(0.0, info.remaining_solar_w - consumption)
 
 
 def _solar_consumption_for_device(
     device: DeviceScheduleRequest,
+    state: _DeviceState,
     slot_start: datetime,
     current_slot_start: datetime,
 ) -> float:
@@ -740,90 +1003,165 @@ def _solar_consumption_for_device(
     devices that are off, use peak as a safe upper bound.
     """
     if slot_start == current_slot_start:
-        return device.effective_usage_w
+        return state.current_slot_usage_w
     return device.peak_usage_w
 
 
-def _find_cheapest_assignment(
+def _apply_cost_optimal(
     active_devices: list[DeviceScheduleRequest],
+    eligible_by_device: list[list[datetime]],
     states: dict[str, _DeviceState],
     slot_info: dict[datetime, _SlotInfo],
-    now: datetime,
-) -> tuple[DeviceScheduleRequest | None, datetime | None]:
-    """Find the single globally cheapest (device, slot) pair to assign next."""
-    best_cost = float("inf")
-    best_device: DeviceScheduleRequest | None = None
-    best_slot_time: datetime | None = None
+    current_slot_start: datetime,
+) -> None:
+    """
+    Phase 2: Iteratively assign the globally cheapest (device, slot) pair.
+
+    Every open (device, slot) candidate sits in a min-heap keyed by
+    ``(cost, priority, device order, slot index)``, which breaks ties the
+    same way a full scan in priority order would.  Assigning a device only
+    changes the cost of that one slot, so its remaining candidates are
+    re-queued under a bumped slot version and older entries for the slot
+    are discarded lazily when popped.
+
+    Slots are addressed by their position in the chronologically keyed
+    ``slot_info`` so the hot loop indexes lists instead of hashing and
+    comparing datetimes.  Devices forced on in phase 1 already hold every
+    eligible slot and contribute no candidates.
+
+    Without any solar surplus no assignment changes a slot's cost, so each
+    device simply takes its cheapest eligible slots.
+    """
+    if not any(info.remaining_solar_w > 0 for info in slot_info.values()):
+        _assign_cheapest_slots(active_devices, eligible_by_device, states, slot_info)
+        return
 
-    for device in active_devices:
-        state = states[device.subentry_id]
+    slot_starts, slots = _ordered_slots(slot_info)
+    slot_index = {st: i for i, st in enumerate(slot_starts)}
+    slot_version = [0] * len(slots)
+    device_states = [states[device.subentry_id] for device in active_devices]
+
+    heap: list[tuple[float, int, int, int, int]] = []
+    # Devices (by order) that can still take each slot, so re-pricing a
+    # depleted slot only visits the devices that are actually affected.
+    open_devices: list[list[int]] = [[] for _ in slots]
+
+    for idx, (device, eligible) in enumerate(
+        zip(active_devices, eligible_by_device, strict=True)
+    ):
+        state = device_states[idx]
+        if state.forced_on:
+            continue
+        candidates = [slot_index[st] for st in eligible]
+        for slot_idx in candidates:
+            open_devices[slot_idx].append(idx)
         if state.remaining_needed <= 0:
             continue
+        heap.extend(
+            (
+                _cost_for_device_in_slot(slots[slot_idx], device.peak_usage_w),
+                device.priority,
+                idx,
+                slot_idx,
+                0,
+            )
+            for slot_idx in candidates
+        )
+    heapq.heapify(heap)
+
+    heappop = heapq.heappop
+    heappush = heapq.heappush
+    while heap:
+        _cost, _priority, idx, slot_idx, version = heappop(heap)
+        state = device_states[idx]
+        if version != slot_version[slot_idx] or state.remaining_needed <= 0:
+            continue
 
-        eligible = _get_eligible_slots(slot_info, now, device.deadline)
-        already = set(state.assigned_slots)
-
-        for st in eligible:
-            if st in already:
-                continue
-            cost = _cost_for_device_in_slot(slot_info[st], device.peak_usage_w)
+        best_device = active_devices[idx]
+        st = slot_starts[slot_idx]
+        state.assigned_slots.append(st)
+        state.assigned_set.add(st)
+        state.remaining_needed -= 1
+        open_devices[slot_idx].remove(idx)
 
-            # Pick lowest cost; break ties by priority (lower = better)
-            if cost < best_cost or (
-                cost == best_cost
-                and best_device is not None
-                and device.priority < best_device.priority
-            ):
-                best_cost = cost
-                best_device = device
-                best_slot_time = st
+        # Consume solar surplus — use actual draw for current slot
+        consumption = _solar_consumption_for_device(
+            best_device, state, st, current_slot_start
+        )
+        info = slots[slot_idx]
+        info.remaining_solar_w = max(0.0, info.remaining_solar_w - consumption)
 
-    return best_device, best_slot_time
+        # Re-price the other devices' candidates for the depleted slot
+        slot_version[slot_idx] += 1
+        version = slot_version[slot_idx]
+        for other_idx in open_devices[slot_idx]:
+            if device_states[other_idx].remaining_needed <= 0:
+                continue
+            other = active_devices[other_idx]
+            heappush(
+                heap,
+                (
+                    _cost_for_device_in_slot(info, other.peak_usage_w),
+                    other.priority,
+                    other_idx,
+                    slot_idx,
+                    version,
+                ),
+            )
 
 
-def _apply_cost_optimal(
+def _assign_cheapest_slots(
     active_devices: list[DeviceScheduleRequest],
+    eligible_by_device: list[list[datetime]],
     states: dict[str, _DeviceState],
     slot_info: dict[datetime, _SlotInfo],
-    now: datetime,
-    current_slot_start: datetime,
 ) -> None:
-    """Phase 2: Iteratively assign the globally cheapest (device, slot) pair."""
-    while True:
-        best_device, best_slot_time = _find_cheapest_assignment(
-            active_devices, states, slot_info, now
-        )
-        if best_device is None or best_slot_time is None:
-            break
-
-        state = states[best_device.subentry_id]
-        state.assigned_slots.append(best_slot_time)
-        state.remaining_needed -= 1
+    """
+    Phase 2 without solar: give each device its cheapest eligible slots.
 
-        # Consume solar surplus — use actual draw for current slot
-        consumption = _solar_consumption_for_device(
-            best_device, best_slot_time, current_slot_start
+    Slot costs are fixed when there is no surplus to share, so devices do
+    not compete and the global pick order reduces to a per-device
+    selection.  Equal costs go to the earliest slot, as in the heap.
+    """
+    for device, eligible in zip(active_devices, eligible_by_device, strict=True):
+        state = states[device.subentry_id]
+        if state.forced_on or state.remaining_needed <= 0:
+            continue
+        peak_usage_w = device.peak_usage_w
+        cheapest = heapq.nsmallest(
+            state.remaining_needed,
+            (
+                (_cost_for_device_in_slot(slot_info[st], peak_usage_w), i, st)
+                for i, st in enumerate(eligible)
+            ),
         )
-        info = slot_info[best_slot_time]
-        info.remaining_solar_w = max(0.0, info.remaining_solar_w - consumption)
+        for _cost, _i, st in cheapest:
+            state.assigned_slots.append(st)
+            state.assigned_set.add(st)
+        state.remaining_needed -= len(cheapest)
 
 
 def _build_result(
     device: DeviceScheduleRequest,
     state: _DeviceState,
-    slot_info: dict[datetime, _SlotInfo],
+    current_slot_surplus_w: float | None,
     current_slot_start: datetime,
 ) -> ScheduleResult:
-    """Build a ScheduleResult for a single device from its assignment state."""
+    """
+    Build a ScheduleResult for a single device from its assignment state.
+
+    ``current_slot_surplus_w`` is the current slot's original solar surplus,
+    or ``None`` when there is no slot info for the current slot.
+    """
     slots = sorted(state.assigned_slots)
-    should_be_on = current_slot_start in slots
+    should_be_on = current_slot_start in state.assigned_set
 
     # Determine if current slot is solar-powered (check original surplus)
-    solar_powered = False
-    if should_be_on and current_slot_start in slot_info:
-        solar_powered = (
-            slot_info[current_slot_start].solar_surplus_w >= device.peak_usage_w
-        )
+    solar_powered = (
+        should_be_on
+        and current_slot_surplus_w is not None
+        and current_slot_surplus_w >= device.peak_usage_w
+    )
 
     if state.forced_on and should_be_on:
         reason = "Forced on: deadline pressure"
@@ -851,6 +1189,8 @@ def compute_schedules(  # noqa: PLR0913
     home_consumption_w: float,
     now: datetime,
     live_solar_surplus_w: float | None = None,
+    solar_by_hour: dict[datetime, float] | None = None,
+    current_slot_start: datetime | None = None,
 ) -> tuple[dict[str, ScheduleResult], dict[datetime, _SlotInfo]]:
     """
     Compute the globally optimal schedule for all devices.
@@ -884,43 +1224,17 @@ def compute_schedules(  # noqa: PLR0913
 
     """
     slot_info = _build_slot_info(
-        price_slots, solar_forecast, home_consumption_w, now, live_solar_surplus_w
+        price_slots,
+        solar_forecast,
+        home_consumption_w,
+        now,
+        live_solar_surplus_w,
+        solar_by_hour,
+        current_slot_start,
+    )
+    return _compute_schedules_with_slot_info(
+        devices, slot_info, now, current_slot_start
     )
-    current_slot_start = _get_current_slot_start(now)
-
-    results: dict[str, ScheduleResult] = {}
-    states: dict[str, _DeviceState] = {}
-    active_devices: list[DeviceScheduleRequest] = []
-
-    for device in devices:
-        if device.remaining_runtime_min <= 0:
-            results[device.subentry_id] = ScheduleResult(
-                subentry_id=device.subentry_id,
-                should_be_on=False,
-                remaining_runtime_min=0.0,
-                reason="Daily runtime already met",
-            )
-            continue
-        active_devices.append(device)
-        states[device.subentry_id] = _DeviceState(
-            remaining_needed=device.remaining_slots_needed,
-        )
-
-    if not active_devices:
-        return results, slot_info
-
-    # Sort by priority for deterministic processing (1 = highest)
-    active_devices.sort(key=lambda d: d.priority)
-
-    _apply_deadline_forced(active_devices, states, slot_info, now, current_slot_start)
-    _apply_cost_optimal(active_devices, states, slot_info, now, current_slot_start)
-
-    for device in active_devices:
-        results[device.subentry_id] = _build_result(
-            device, states[device.subentry_id], slot_info, current_slot_start
-        )
-
-    return results, slot_info
 
 
 def _determine_reason(
@@ -944,50 +1258,74 @@ def _determine_reason(
 
 def _get_current_slot_start(now: datetime) -> datetime:
     """Get the start time of the current 15-minute slot."""
-    minute = (now.minute // SLOT_DURATION_MIN) * SLOT_DURATION_MIN
-    return now.replace(minute=minute, second=0, microsecond=0)
+    minute = now.minute
+    return now.replace(
+        minute=minute - minute % SLOT_DURATION_MIN, second=0, microsecond=0
+    )
+
+
+def _collect_state_entity_ids(
+    index: _EntryIndex,
+    devices: list[DeviceScheduleRequest],
+) -> set[str]:
+    """Collect the entity IDs whose live state a scheduling cycle reads."""
+    entity_ids = set(index.state_entity_ids)
+    for device in devices:
+        entity_ids.update((device.switch_entity, device.power_sensor))
+    return entity_ids
+
+
+def _try_float_state(state: State | None) -> float | None:
+    """Return the numeric value of a state, or None if missing or unparseable."""
+    if state is None or state.state in _UNAVAILABLE_STATES:
+        return None
+    try:
+        return float(state.state)
+    except (ValueError, TypeError):
+        return None
+
+
+def _snapshot_states(
+    hass: HomeAssistant,
+    entity_ids: set[str],
+) -> dict[str, State | None]:
+    """Read the current state of each entity once for a scheduling cycle."""
+    return {entity_id: hass.states.get(entity_id) for entity_id in entity_ids}
 
 
 async def _async_populate_switch_devices(
     hass: HomeAssistant,
+    states: Mapping[str, State | None],
     devices: list[DeviceScheduleRequest],
 ) -> None:
     """Populate live state for switch device requests."""
+    if not devices:
+        return
+
+    # Runtimes for all devices come from a single recorder query
+    runtimes = await async_get_runtimes_today_minutes(
+        hass, states, [device.switch_entity for device in devices]
+    )
     for device in devices:
-        device.runtime_today_min = await async_get_runtime_today_minutes(
-            hass, device.switch_entity
-        )
-        switch_state = hass.states.get(device.switch_entity)
+        device.runtime_today_min = runtimes[device.switch_entity]
+        switch_state = states.get(device.switch_entity)
         device.is_on = switch_state is not None and switch_state.state == "on"
-        power_state = hass.states.get(device.power_sensor)
-        if power_state and power_state.state not in ("unknown", "unavailable"):
-            try:
-                device.actual_usage_w = float(power_state.state)
-            except (ValueError, TypeError):
-                device.actual_usage_w = None
+        device.actual_usage_w = _try_float_state(states.get(device.power_sensor))
 
 
 def _populate_thermostat_live_state(
-    hass: HomeAssistant,
+    states: Mapping[str, State | None],
     thermostats: list[ThermostatScheduleRequest],
 ) -> None:
     """Populate live sensor readings for thermostat requests."""
     for therm in thermostats:
-        temp_state = hass.states.get(therm.temperature_sensor)
-        if temp_state and temp_state.state not in ("unknown", "unavailable"):
-            try:
-                therm.current_temperature = float(temp_state.state)
-            except (ValueError, TypeError):
-                therm.current_temperature = None
-
-        switch_state = hass.states.get(therm.switch_entity)
+        therm.current_temperature = _try_float_state(
+            states.get(therm.temperature_sensor)
+        )
+
+        switch_state = states.get(therm.switch_entity)
         therm.is_on = switch_state is not None and switch_state.state == "on"
-        power_state = hass.states.get(therm.power_sensor)
-        if power_state and power_state.state not in ("unknown", "unavailable"):
-            try:
-                therm.actual_usage_w = float(power_state.state)
-            except (ValueError, TypeError):
-                therm.actual_usage_w = None
+        therm.actual_usage_w = _try_float_state(states.get(therm.power_sensor))
 
 
 def _ensure_slot_info(  # noqa: PLR0913
@@ -997,12 +1335,20 @@ def _ensure_slot_info(  # noqa: PLR0913
     home_consumption_w: float,
     now: datetime,
     live_solar_surplus_w: float | None,
+    solar_by_hour: dict[datetime, float] | None,
+    current_slot_start: datetime,
 ) -> dict[datetime, _SlotInfo]:
     """Return existing slot info or build it fresh."""
     if shared_slot_info is not None:
         return shared_slot_info
     return _build_slot_info(
-        price_slots, solar_forecast, home_consumption_w, now, live_solar_surplus_w
+        price_slots,
+        solar_forecast,
+        home_consumption_w,
+        now,
+        live_solar_surplus_w,
+        solar_by_hour,
+        current_slot_start,
     )
 
 
@@ -1015,15 +1361,37 @@ async def async_run_scheduler(
     results: dict[str, ScheduleResult] = {}
 
     price_slots = _get_all_future_slots(coordinator)
-    solar_forecast = await async_get_solar_forecast(hass, entry, coordinator)
+    devices = _build_device_requests(entry, coordinator)
+    index = _build_entry_index(entry, coordinator)
+
+    # The solar forecast and the thermostat power lookups are independent
+    # I/O, so they run together; if one fails the other is cancelled.
+    async with asyncio.TaskGroup() as tg:
+        forecast_task = tg.create_task(
+            async_get_solar_forecast(hass, entry, coordinator)
+        )
+        thermostats_task = tg.create_task(
+            _async_build_thermostat_requests(hass, entry, coordinator)
+        )
+    solar_forecast = forecast_task.result()
+    thermostats = thermostats_task.result()
     coordinator.solar_forecast = solar_forecast
-    raw_home_consumption_w = _get_home_consumption(hass, entry)
+    # Use the coordinator's pre-parsed forecast when it has one; otherwise
+    # parse here once so every slot info build below shares the lookup.
+    solar_by_hour = coordinator.get_cached_slot_solar()
+    if solar_by_hour is None:
+        solar_by_hour = _parse_solar_forecast(solar_forecast)
+
+    # Read every live entity state once, after the I/O above so the readings
+    # match the moment the schedule is computed for; all helpers below share
+    # the snapshot.
+    states = _snapshot_states(hass, _collect_state_entity_ids(index, devices))
     now = dt_util.now()
+    current_slot_start = _get_current_slot_start(now)
 
-    # --- Switch devices ---
-    devices = _build_device_requests(entry)
-    if devices:
-        await _async_populate_switch_devices(hass, devices)
+    await _async_populate_switch_devices(hass, states, devices)
+    _populate_thermostat_live_state(states, thermostats)
+    raw_home_consumption_w = _get_home_consumption(states, index)
 
     # Subtract power draw of Zeus-managed devices that are currently ON from
     # home consumption.  The home monitor reports total household load which
@@ -1031,7 +1399,7 @@ async def async_run_scheduler(
     # device turning on inflates home consumption → reduces the apparent
     # solar surplus → scheduler reschedules the device to a "cheaper" slot
     # → device turns off → surplus returns → feedback loop.
-    managed_draw_w = _get_managed_device_draw(hass, entry, devices)
+    managed_draw_w = _get_managed_device_draw(states, index, devices, thermostats)
     home_consumption_w = max(0.0, raw_home_consumption_w - managed_draw_w)
     if managed_draw_w > 0:
         _LOGGER.debug(
@@ -1040,13 +1408,13 @@ async def async_run_scheduler(
             managed_draw_w,
             home_consumption_w,
         )
-    live_solar_surplus_w = _get_live_solar_surplus(hass, entry, home_consumption_w)
+    live_solar_surplus_w = _get_live_solar_surplus(states, index, home_consumption_w)
 
     # Build shared slot info once — all device types deplete the same solar pool.
     shared_slot_info: dict[datetime, _SlotInfo] | None = None
 
     # --- Manual device reservations (apply BEFORE smart device scheduling) ---
-    manual_requests = _build_manual_device_requests(hass, entry)
+    manual_requests = _build_manual_device_requests(hass, entry, coordinator)
     active_reservations = coordinator.get_active_reservations()
     if active_reservations and manual_requests:
         shared_slot_info = _ensure_slot_info(
@@ -1056,6 +1424,8 @@ async def async_run_scheduler(
             home_consumption_w,
             now,
             live_solar_surplus_w,
+            solar_by_hour,
+            current_slot_start,
         )
         apply_reservations_to_slot_info(
             shared_slot_info, active_reservations, manual_requests
@@ -1065,7 +1435,7 @@ async def async_run_scheduler(
     if devices:
         if shared_slot_info is not None:
             switch_results, shared_slot_info = _compute_schedules_with_slot_info(
-                devices, shared_slot_info, now
+                devices, shared_slot_info, now, current_slot_start
             )
         else:
             switch_results, shared_slot_info = compute_schedules(
@@ -1075,13 +1445,13 @@ async def async_run_scheduler(
                 home_consumption_w,
                 now,
                 live_solar_surplus_w=live_solar_surplus_w,
+                solar_by_hour=solar_by_hour,
+                current_slot_start=current_slot_start,
             )
         results.update(switch_results)
 
     # --- Thermostat devices ---
-    thermostats = await _async_build_thermostat_requests(hass, entry, coordinator)
     if thermostats:
-        _populate_thermostat_live_state(hass, thermostats)
         results.update(
             compute_thermostat_decisions(
                 thermostats,
@@ -1091,6 +1461,8 @@ async def async_run_scheduler(
                 now,
                 live_solar_surplus_w=live_solar_surplus_w,
                 slot_info=shared_slot_info,
+                solar_by_hour=solar_by_hour,
+                current_slot_start=current_slot_start,
             )
         )
 
@@ -1103,11 +1475,15 @@ async def async_run_scheduler(
             home_consumption_w,
             now,
             live_solar_surplus_w,
+            solar_by_hour,
+            current_slot_start,
         )
+        manual_eligible = _manual_eligible_slots(shared_slot_info, now)
+        manual_cache = _ManualRankingCache()
         manual_results: dict[str, ManualDeviceRanking] = {}
         for req in manual_requests:
             manual_results[req.subentry_id] = compute_manual_device_rankings(
-                req, shared_slot_info, now
+                req, shared_slot_info, now, manual_eligible, manual_cache
             )
         coordinator.manual_device_results = manual_results
 
@@ -1118,15 +1494,16 @@ def _compute_schedules_with_slot_info(
     devices: list[DeviceScheduleRequest],
     slot_info: dict[datetime, _SlotInfo],
     now: datetime,
+    current_slot_start: datetime | None = None,
 ) -> tuple[dict[str, ScheduleResult], dict[datetime, _SlotInfo]]:
     """
     Run the switch scheduling algorithm on pre-built slot info.
 
     Used when slot_info was already created (e.g. to apply manual device
     reservations) so we don't rebuild and lose the reservation deductions.
+    Devices whose runtime is already met are resolved without running the
+    scheduling phases, which are skipped entirely when no device needs time.
     """
-    current_slot_start = _get_current_slot_start(now)
-
     results: dict[str, ScheduleResult] = {}
     states: dict[str, _DeviceState] = {}
     active_devices: list[DeviceScheduleRequest] = []
@@ -1143,19 +1520,47 @@ def _compute_schedules_with_slot_info(
         active_devices.append(device)
         states[device.subentry_id] = _DeviceState(
             remaining_needed=device.remaining_slots_needed,
+            current_slot_usage_w=device.effective_usage_w,
         )
 
     if not active_devices:
         return results, slot_info
 
-    active_devices.sort(key=lambda d: d.priority)
+    if current_slot_start is None:
+        current_slot_start = _get_current_slot_start(now)
 
-    _apply_deadline_forced(active_devices, states, slot_info, now, current_slot_start)
-    _apply_cost_optimal(active_devices, states, slot_info, now, current_slot_start)
+    # Sort by priority for deterministic processing (1 = highest)
+    active_devices.sort(key=attrgetter("priority"))
 
+    # Eligible slots are shared by both phases and by devices with the
+    # same deadline; neither phase mutates them.
+    slot_starts, _ = _ordered_slots(slot_info)
+    eligible_by_deadline: dict[time, list[datetime]] = {}
+    eligible_by_device = []
+    for device in active_devices:
+        eligible = eligible_by_deadline.get(device.deadline)
+        if eligible is None:
+            eligible = eligible_by_deadline[device.deadline] = _get_eligible_slots(
+                slot_starts, now, device.deadline
+            )
+        eligible_by_device.append(eligible)
+    _apply_deadline_forced(
+        active_devices, eligible_by_device, states, slot_info, current_slot_start
+    )
+    _apply_cost_optimal(
+        active_devices, eligible_by_device, states, slot_info, current_slot_start
+    )
+
+    current_slot = slot_info.get(current_slot_start)
+    current_slot_surplus_w = (
+        current_slot.solar_surplus_w if current_slot is not None else None
+    )
     for device in active_devices:
         results[device.subentry_id] = _build_result(
-            device, states[device.subentry_id], slot_info, current_slot_start
+            device,
+            states[device.subentry_id],
+            current_slot_surplus_w,
+            current_slot_start,
         )
 
     return results, slot_info
@@ -1174,9 +1579,10 @@ def _get_all_future_slots(coordinator: PriceCoordinator) -> list[PriceSlot]:
 
 
 def _get_managed_device_draw(
-    hass: HomeAssistant,
-    entry: ConfigEntry,
+    states: Mapping[str, State | None],
+    index: _EntryIndex,
     switch_devices: list[DeviceScheduleRequest] | None = None,
+    thermostats: list[ThermostatScheduleRequest] | None = None,
 ) -> float:
     """
     Sum the live power draw of all Zeus-managed devices that are currently ON.
@@ -1185,6 +1591,9 @@ def _get_managed_device_draw(
     subtracted from the home monitor reading so that Zeus's own managed
     load doesn't inflate the "background" home consumption used for
     solar surplus calculations.
+
+    When ``thermostats`` is given (already populated with live state), their
+    readings are used instead of looking up the thermostat subentries again.
     """
     total = 0.0
 
@@ -1194,43 +1603,39 @@ def _get_managed_device_draw(
             if device.is_on and device.actual_usage_w is not None:
                 total += device.actual_usage_w
 
+    if thermostats is not None:
+        for therm in thermostats:
+            if therm.is_on and therm.actual_usage_w is not None:
+                total += therm.actual_usage_w
+        return total
+
     # Thermostat devices — read directly from power sensors
-    for subentry in entry.subentries.values():
-        if subentry.subentry_type != SUBENTRY_THERMOSTAT_DEVICE:
-            continue
-        switch_entity = subentry.data.get(CONF_SWITCH_ENTITY)
-        power_sensor = subentry.data.get(CONF_POWER_SENSOR)
-        if not switch_entity or not power_sensor:
-            continue
-        switch_state = hass.states.get(switch_entity)
+    for switch_entity, power_sensor in index.thermostat_entities:
+        switch_state = states.get(switch_entity)
         if switch_state is None or switch_state.state != "on":
             continue
-        power_state = hass.states.get(power_sensor)
-        if power_state and power_state.state not in ("unknown", "unavailable"):
-            with contextlib.suppress(ValueError, TypeError):
-                total += float(power_state.state)
+        power_w = _try_float_state(states.get(power_sensor))
+        if power_w is not None:
+            total += power_w
 
     return total
 
 
-def _get_home_consumption(hass: HomeAssistant, entry: ConfigEntry) -> float:
+def _get_home_consumption(
+    states: Mapping[str, State | None],
+    index: _EntryIndex,
+) -> float:
     """Get current home consumption from the home monitor subentry."""
-    for subentry in entry.subentries.values():
-        if subentry.subentry_type == SUBENTRY_HOME_MONITOR:
-            entity_id = subentry.data.get(CONF_ENERGY_USAGE_ENTITY)
-            if entity_id:
-                state = hass.states.get(entity_id)
-                if state and state.state not in ("unknown", "unavailable"):
-                    try:
-                        return float(state.state)
-                    except (ValueError, TypeError):
-                        pass
+    for entity_id in index.home_monitor_entities:
+        consumption_w = _try_float_state(states.get(entity_id))
+        if consumption_w is not None:
+            return consumption_w
     return 0.0
 
 
 def _get_live_solar_surplus(
-    hass: HomeAssistant,
-    entry: ConfigEntry,
+    states: Mapping[str, State | None],
+    index: _EntryIndex,
     home_consumption_w: float,
 ) -> float | None:
     """
@@ -1240,23 +1645,17 @@ def _get_live_solar_surplus(
     Returns None if no solar inverter is configured or the sensor is
     unavailable, so the scheduler can fall back to forecast-only mode.
     """
-    for subentry in entry.subentries.values():
-        if subentry.subentry_type != SUBENTRY_SOLAR_INVERTER:
-            continue
-        entity_id = subentry.data.get(CONF_PRODUCTION_ENTITY)
-        if not entity_id:
-            continue
-        state = hass.states.get(entity_id)
-        if state and state.state not in ("unknown", "unavailable"):
-            try:
-                production_w = float(state.state)
-                return max(0.0, production_w - home_consumption_w)
-            except (ValueError, TypeError):
-                _LOGGER.debug(
-                    "Could not parse solar production from %s: %s",
-                    entity_id,
-                    state.state,
-                )
+    for entity_id in index.production_entities:
+        state = states.get(entity_id)
+        production_w = _try_float_state(state)
+        if production_w is not None:
+            return max(0.0, production_w - home_consumption_w)
+        if state is not None and state.state not in _UNAVAILABLE_STATES:
+            _LOGGER.debug(
+                "Could not parse solar production from %s: %s",
+                entity_id,
+                state.state,
+            )
     return None
 
 
@@ -1274,17 +1673,18 @@ _SOLAR_WAIT_URGENCY_THRESHOLD = 0.6
 _URGENCY_FALLBACK_THRESHOLD = 0.5
 
 
-def _percentile_rank(value: float, values: list[float]) -> float:
+def _percentile_rank(value: float, sorted_values: list[float]) -> float:
     """
-    Compute the percentile rank of *value* within *values* (0.0 to 1.0).
+    Compute the percentile rank of *value* within *sorted_values* (0.0 to 1.0).
 
-    A rank of 0.0 means *value* is the cheapest; 1.0 means the most expensive.
-    Returns 0.5 if *values* is empty.
+    *sorted_values* must be in ascending order; the number of values below
+    *value* is then found by bisection.  A rank of 0.0 means *value* is the
+    cheapest; 1.0 means the most expensive.  Returns 0.5 if *sorted_values*
+    is empty.
     """
-    if not values:
+    if not sorted_values:
         return 0.5
-    count_below = sum(1 for v in values if v < value)
-    return count_below / len(values)
+    return bisect_left(sorted_values, value) / len(sorted_values)
 
 
 def compute_thermostat_decisions(  # noqa: PLR0913
@@ -1295,6 +1695,8 @@ def compute_thermostat_decisions(  # noqa: PLR0913
     now: datetime,
     live_solar_surplus_w: float | None = None,
     slot_info: dict[datetime, _SlotInfo] | None = None,
+    solar_by_hour: dict[datetime, float] | None = None,
+    current_slot_start: datetime | None = None,
 ) -> dict[str, ScheduleResult]:
     """
     Compute heating decisions for all thermostat devices.
@@ -1310,6 +1712,7 @@ def compute_thermostat_decisions(  # noqa: PLR0913
 
     Devices are processed by priority (1 = highest) so that higher-priority
     zones consume solar surplus first, leaving less for lower-priority zones.
+    ``thermostats`` is sorted in place.
 
     When ``slot_info`` is provided (e.g. pre-depleted by switch device
     scheduling), it is reused so that thermostats see the remaining solar
@@ -1318,53 +1721,63 @@ def compute_thermostat_decisions(  # noqa: PLR0913
     if not thermostats:
         return {}
 
+    if current_slot_start is None:
+        current_slot_start = _get_current_slot_start(now)
+
     # Reuse shared slot_info if provided, otherwise build fresh
     if slot_info is None:
         slot_info = _build_slot_info(
-            price_slots, solar_forecast, home_consumption_w, now, live_solar_surplus_w
+            price_slots,
+            solar_forecast,
+            home_consumption_w,
+            now,
+            live_solar_surplus_w,
+            solar_by_hour,
+            current_slot_start,
         )
-    current_slot_start = _get_current_slot_start(now)
 
-    # Get current and upcoming price slots for comparison
+    # Get current and upcoming price slots for comparison.  slot_info is
+    # keyed chronologically, so the lookahead is a slice after a bisection.
     current_slot = slot_info.get(current_slot_start)
-    upcoming_slots = sorted(
-        (s for st, s in slot_info.items() if st > current_slot_start),
-        key=lambda s: s.start_time,
-    )[:_THERMOSTAT_LOOKAHEAD_SLOTS]
+    slot_starts, slots = _ordered_slots(slot_info)
+    first_upcoming = bisect_right(slot_starts, current_slot_start)
+    upcoming_slots = slots[
+        first_upcoming : first_upcoming + _THERMOSTAT_LOOKAHEAD_SLOTS
+    ]
 
-    upcoming_prices = [s.price for s in upcoming_slots]
+    # Sorted once so every thermostat's price rank is a bisection
+    upcoming_prices = sorted(s.price for s in upcoming_slots)
 
     # Sort by priority (1 = highest) for deterministic solar allocation
-    sorted_thermostats = sorted(thermostats, key=lambda t: t.priority)
+    thermostats.sort(key=attrgetter("priority"))
 
     results: dict[str, ScheduleResult] = {}
 
-    for thermostat in sorted_thermostats:
+    for thermostat in thermostats:
         result = _decide_thermostat(
             thermostat,
             current_slot,
             upcoming_prices,
             upcoming_slots,
-            slot_info,
             current_slot_start,
         )
         results[thermostat.subentry_id] = result
 
         # Consume solar surplus if this thermostat will heat
-        if result.should_be_on and current_slot_start in slot_info:
-            info = slot_info[current_slot_start]
+        if result.should_be_on and current_slot is not None:
             consumption = thermostat.actual_usage_w or thermostat.effective_power_w
-            info.remaining_solar_w = max(0.0, info.remaining_solar_w - consumption)
+            current_slot.remaining_solar_w = max(
+                0.0, current_slot.remaining_solar_w - consumption
+            )
 
     return results
 
 
-def _decide_thermostat(  # noqa: PLR0913
+def _decide_thermostat(
     thermostat: ThermostatScheduleRequest,
     current_slot: _SlotInfo | None,
     upcoming_prices: list[float],
     upcoming_slots: list[_SlotInfo],
-    slot_info: dict[datetime, _SlotInfo],
     current_slot_start: datetime,
 ) -> ScheduleResult:
     """
@@ -1428,17 +1841,15 @@ def _decide_thermostat(  # noqa: PLR0913
         current_slot,
         upcoming_prices,
         upcoming_slots,
-        slot_info,
         current_slot_start,
     )
 
 
-def _decide_thermostat_optimized(  # noqa: PLR0913
+def _decide_thermostat_optimized(
     thermostat: ThermostatScheduleRequest,
     current_slot: _SlotInfo | None,
     upcoming_prices: list[float],
     upcoming_slots: list[_SlotInfo],
-    slot_info: dict[datetime, _SlotInfo],
     current_slot_start: datetime,
 ) -> ScheduleResult:
     """
@@ -1485,7 +1896,12 @@ def _decide_thermostat_optimized(  # noqa: PLR0913
 
     # Thermal headroom: if we know Wh/°C, estimate how long until lower bound
     headroom_result = _check_thermal_headroom(
-        thermostat, upcoming_prices, upcoming_slots, slot_info, current_slot_start
+        thermostat,
+        power_w,
+        current_slot,
+        upcoming_prices,
+        upcoming_slots,
+        current_slot_start,
     )
     if headroom_result is not None:
         return headroom_result
@@ -1539,23 +1955,26 @@ _HEADROOM_COAST_HOURS = 2.0  # Coast if we can go this long before lower bound
 _HEADROOM_URGENT_HOURS = 0.5  # Boost urgency if time to lower bound is this short
 
 
-def _check_thermal_headroom(
+def _check_thermal_headroom(  # noqa: PLR0913
     thermostat: ThermostatScheduleRequest,
+    power_w: float,
+    current_slot: _SlotInfo | None,
     upcoming_prices: list[float],
     upcoming_slots: list[_SlotInfo],
-    slot_info: dict[datetime, _SlotInfo],
     current_slot_start: datetime,
 ) -> ScheduleResult | None:
     """
     Use thermal model to decide whether to coast or heat urgently.
 
+    ``power_w`` is the thermostat's effective power draw, as already
+    resolved by the caller.
+
     Returns a ScheduleResult if the thermal model provides a clear signal,
     or None to fall through to the normal price-based decision.
     """
     if thermostat.wh_per_degree is None or thermostat.current_temperature is None:
         return None
 
-    power_w = thermostat.effective_power_w
     if power_w <= 0:
         return None
 
@@ -1571,11 +1990,7 @@ def _check_thermal_headroom(
     if coast_time_hours > _HEADROOM_COAST_HOURS and upcoming_prices:
         coast_slots = int(coast_time_hours * 60 / SLOT_DURATION_MIN)
         reachable = upcoming_slots[:coast_slots]
-        current_price = (
-            slot_info[current_slot_start].price
-            if current_slot_start in slot_info
-            else None
-        )
+        current_price = current_slot.price if current_slot is not None else None
         if current_price is not None and any(
             s.price < current_price for s in reachable
         ):
@@ -1591,19 +2006,17 @@ def _check_thermal_headroom(
             )
 
     # Very little headroom — boost effective urgency to accept current slot
-    if coast_time_hours < _HEADROOM_URGENT_HOURS:
-        current_slot = slot_info.get(current_slot_start)
-        if current_slot is not None:
-            return ScheduleResult(
-                subentry_id=thermostat.subentry_id,
-                should_be_on=True,
-                remaining_runtime_min=0.0,
-                scheduled_slots=[current_slot_start],
-                reason=(
-                    f"Heating: low thermal headroom"
-                    f" ({coast_time_hours:.1f}h to lower bound)"
-                ),
-            )
+    if coast_time_hours < _HEADROOM_URGENT_HOURS and current_slot is not None:
+        return ScheduleResult(
+            subentry_id=thermostat.subentry_id,
+            should_be_on=True,
+            remaining_runtime_min=0.0,
+            scheduled_slots=[current_slot_start],
+            reason=(
+                f"Heating: low thermal headroom"
+                f" ({coast_time_hours:.1f}h to lower bound)"
+            ),
+        )
 
     return None
 
@@ -1614,10 +2027,10 @@ def _solar_coming_soon(
     max_slots_ahead: int = 3,
 ) -> bool:
     """Check if any upcoming slot (within max_slots_ahead) has enough solar surplus."""
-    for slot in upcoming_slots[:max_slots_ahead]:
-        if slot.remaining_solar_w >= device_peak_w:
-            return True
-    return False
+    return any(
+        slot.remaining_solar_w >= device_peak_w
+        for slot in upcoming_slots[:max_slots_ahead]
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -1625,7 +2038,7 @@ def _solar_coming_soon(
 # ---------------------------------------------------------------------------
 
 
-@dataclass
+@dataclass(slots=True)
 class ManualDeviceScheduleRequest:
     """A non-smart device requesting schedule advice."""
 
@@ -1635,11 +2048,12 @@ class ManualDeviceScheduleRequest:
     cycle_duration_min: float
     priority: int
     power_sensor: str | None = None
-    delay_intervals_h: list[float] | None = None  # e.g. [3, 6, 9]
+    # Ascending delays in hours, e.g. (3.0, 6.0, 9.0)
+    delay_intervals_h: tuple[float, ...] | None = None
     avg_usage_w: float | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ManualDeviceWindow:
     """A single candidate time window for a manual device cycle."""
 
@@ -1650,9 +2064,14 @@ class ManualDeviceWindow:
     delay_hours: float | None = None  # set when device uses delay intervals
 
 
-@dataclass
+@dataclass(slots=True)
 class ManualDeviceRanking:
-    """Ranked windows for a manual device, cheapest first."""
+    """
+    Ranked windows for a manual device, cheapest first.
+
+    ``windows`` holds the ``MAX_RANKED_WINDOWS`` cheapest windows, followed
+    by the earliest-starting window when it did not rank among them.
+    """
 
     subentry_id: str
     windows: list[ManualDeviceWindow]  # sorted cheapest first
@@ -1660,10 +2079,39 @@ class ManualDeviceRanking:
     recommended_end: datetime | None
 
 
+def _manual_eligible_slots(
+    slot_info: dict[datetime, _SlotInfo],
+    now: datetime,
+) -> list[datetime]:
+    """
+    Return the chronological slot starts a manual device may use.
+
+    Only slots until the next 06:00 local time are considered, so
+    recommendations stay within an actionable overnight horizon.  The
+    result depends only on *now*, so one list serves every manual device.
+    """
+    # Only consider slots until the next day at 06:00 local time.
+    tomorrow_6am = (now + timedelta(days=1)).replace(
+        hour=6, minute=0, second=0, microsecond=0
+    )
+    # If it's already past midnight but before 06:00, use today's 06:00
+    today_6am = now.replace(hour=6, minute=0, second=0, microsecond=0)
+    cutoff = today_6am if now < today_6am else tomorrow_6am
+
+    # slot_info is keyed chronologically: keep slots still running at *now*
+    # (start + duration > now) that start before the cutoff.
+    slot_starts, _ = _ordered_slots(slot_info)
+    first = bisect_right(slot_starts, now - _SLOT_DURATION)
+    last = bisect_left(slot_starts, cutoff)
+    return slot_starts[first:last]
+
+
 def compute_manual_device_rankings(
     request: ManualDeviceScheduleRequest,
     slot_info: dict[datetime, _SlotInfo],
     now: datetime,
+    eligible: list[datetime] | None = None,
+    cache: _ManualRankingCache | None = None,
 ) -> ManualDeviceRanking:
     """
     Rank all contiguous time windows for a manual device cycle.
@@ -1674,38 +2122,44 @@ def compute_manual_device_rankings(
     For devices with delay intervals, only windows starting at valid delay
     offsets from ``now`` are considered. Otherwise, every contiguous block
     of ``ceil(cycle_duration / 15)`` future slots is evaluated.
+
+    ``eligible`` may be passed in from ``_manual_eligible_slots`` when
+    ranking several devices against the same slot info.  Along with it, a
+    shared ``cache`` lets devices with equal cycle lengths or power draws
+    reuse each other's window positions and per-slot sums.
     """
     slots_needed = math.ceil(request.cycle_duration_min / SLOT_DURATION_MIN)
     if slots_needed <= 0:
         return _empty_ranking(request.subentry_id)
 
-    # Only consider slots until the next day at 06:00 local time.
-    tomorrow_6am = (now + timedelta(days=1)).replace(
-        hour=6, minute=0, second=0, microsecond=0
-    )
-    # If it's already past midnight but before 06:00, use today's 06:00
-    today_6am = now.replace(hour=6, minute=0, second=0, microsecond=0)
-    cutoff = today_6am if now < today_6am else tomorrow_6am
-
-    eligible = sorted(
-        st
-        for st in slot_info
-        if st + timedelta(minutes=SLOT_DURATION_MIN) > now and st < cutoff
-    )
+    if eligible is None:
+        eligible = _manual_eligible_slots(slot_info, now)
     if not eligible:
         return _empty_ranking(request.subentry_id)
 
+    # Only the cheapest windows (by total cost, then by solar fraction,
+    # higher first) are kept — the rest are never shown — plus the earliest
+    # window, which the recommendation sensor compares against as
+    # "cost if now".
+    if cache is None:
+        cache = _ManualRankingCache()
+    score = _make_window_scorer(request, slot_info, eligible, slots_needed, cache)
+
     if request.delay_intervals_h:
         windows = _rank_delay_interval_windows(
-            request, slot_info, eligible, slots_needed, now
+            request, eligible, slots_needed, score, now
         )
+        if windows:
+            earliest = min(windows, key=attrgetter("start_time"))
+            windows = heapq.nsmallest(
+                MAX_RANKED_WINDOWS,
+                windows,
+                key=lambda w: (w.total_cost, -w.solar_fraction),
+            )
+            if earliest not in windows:
+                windows.append(earliest)
     else:
-        windows = _rank_all_contiguous_windows(
-            request, slot_info, eligible, slots_needed
-        )
-
-    # Sort by total cost (cheapest first), then by solar fraction (higher first)
-    windows.sort(key=lambda w: (w.total_cost, -w.solar_fraction))
+        windows = _rank_all_contiguous_windows(eligible, slots_needed, score, cache)
 
     recommended_start = windows[0].start_time if windows else None
     recommended_end = windows[0].end_time if windows else None
@@ -1728,43 +2182,145 @@ def _empty_ranking(subentry_id: str) -> ManualDeviceRanking:
     )
 
 
-def _rank_all_contiguous_windows(
+# Decimal places window costs are rounded to (far below display precision)
+_COST_DECIMALS = 9
+
+
+@dataclass(slots=True)
+class _ManualRankingCache:
+    """
+    Values shared by manual devices ranked against the same eligible slots.
+
+    All keys are derived from the eligible slots, so one cache must only be
+    used for a single slot info and eligible list.
+    """
+
+    # Contiguous window start indices keyed by slots needed
+    window_starts: dict[int, list[int]] = field(default_factory=dict)
+    # Prefix sums of per-slot cost keyed by the device's usage in watts
+    cost_prefix_sums: dict[float, list[float]] = field(default_factory=dict)
+    # Prefix sums of solar-covered slots keyed by the device's peak watts
+    solar_prefix_sums: dict[float, list[int]] = field(default_factory=dict)
+
+
+def _make_window_scorer(
     request: ManualDeviceScheduleRequest,
     slot_info: dict[datetime, _SlotInfo],
     eligible: list[datetime],
     slots_needed: int,
-) -> list[ManualDeviceWindow]:
-    """Find and score all contiguous windows of the required length."""
-    windows: list[ManualDeviceWindow] = []
+    cache: _ManualRankingCache,
+) -> Callable[[int], tuple[float, float]]:
+    """
+    Build a scorer for windows of one request over the eligible slots.
 
-    for i in range(len(eligible) - slots_needed + 1):
-        window_slots = eligible[i : i + slots_needed]
+    The returned function maps the index in ``eligible`` of a window's
+    first slot to its ``(total_cost, solar_fraction)``.  Costs and solar
+    coverage are differences of prefix sums, so each window is scored with
+    two subtractions; the sums are shared through ``cache`` by requests
+    with the same usage or peak power.
+    """
+    usage_w = request.avg_usage_w or request.peak_usage_w
+    cost_ps = cache.cost_prefix_sums.get(usage_w)
+    if cost_ps is None:
+        cost_ps = cache.cost_prefix_sums[usage_w] = list(
+            accumulate(
+                (_cost_for_device_in_slot(slot_info[st], usage_w) for st in eligible),
+                initial=0.0,
+            )
+        )
 
-        if not _is_contiguous(window_slots):
-            continue
+    peak_usage_w = request.peak_usage_w
+    solar_ps = cache.solar_prefix_sums.get(peak_usage_w)
+    if solar_ps is None:
+        solar_ps = cache.solar_prefix_sums[peak_usage_w] = list(
+            accumulate(
+                (slot_info[st].remaining_solar_w >= peak_usage_w for st in eligible),
+                initial=0,
+            )
+        )
 
-        total_cost, solar_fraction = _score_window(
-            window_slots, slot_info, request.peak_usage_w, request.avg_usage_w
+    # Differences of prefix sums carry rounding noise, so window costs are
+    # rounded to keep equally priced windows tied.
+    def score(i: int) -> tuple[float, float]:
+        end = i + slots_needed
+        return (
+            round(cost_ps[end] - cost_ps[i], _COST_DECIMALS),
+            (solar_ps[end] - solar_ps[i]) / slots_needed,
         )
-        end_time = window_slots[-1] + timedelta(minutes=SLOT_DURATION_MIN)
 
-        windows.append(
-            ManualDeviceWindow(
-                start_time=window_slots[0],
-                end_time=end_time,
-                total_cost=total_cost,
-                solar_fraction=solar_fraction,
-            )
+    return score
+
+
+def _rank_all_contiguous_windows(
+    eligible: list[datetime],
+    slots_needed: int,
+    score: Callable[[int], tuple[float, float]],
+    cache: _ManualRankingCache,
+) -> list[ManualDeviceWindow]:
+    """
+    Score all contiguous windows of the required length and rank them.
+
+    Only the ``MAX_RANKED_WINDOWS`` cheapest windows, plus the earliest one,
+    are materialized as ``ManualDeviceWindow`` objects.
+    """
+    starts = cache.window_starts.get(slots_needed)
+    if starts is None:
+        starts = cache.window_starts[slots_needed] = _contiguous_window_starts(
+            eligible, slots_needed
         )
+    if not starts:
+        return []
+
+    # Rank lightweight (cost, -solar fraction, index, solar fraction)
+    # tuples; the index keeps equal-scoring windows in chronological order.
+    # Scores stream straight into the bounded selection without a list.
+    def rank_key(i: int) -> tuple[float, float, int, float]:
+        total_cost, solar_fraction = score(i)
+        return total_cost, -solar_fraction, i, solar_fraction
+
+    ranked = heapq.nsmallest(MAX_RANKED_WINDOWS, map(rank_key, starts))
+    if all(entry[2] != starts[0] for entry in ranked):
+        ranked.append(rank_key(starts[0]))
+
+    return [
+        ManualDeviceWindow(
+            start_time=eligible[i],
+            end_time=eligible[i + slots_needed - 1] + _SLOT_DURATION,
+            total_cost=total_cost,
+            solar_fraction=solar_fraction,
+        )
+        for total_cost, _, i, solar_fraction in ranked
+    ]
 
-    return windows
+
+def _contiguous_window_starts(
+    eligible: list[datetime],
+    slots_needed: int,
+) -> list[int]:
+    """
+    Return the indices in ``eligible`` where a contiguous window starts.
+
+    A single pass tracks where the current run of back-to-back slots began;
+    every slot that ends a long enough run closes one window.
+    """
+    starts: list[int] = []
+    run_start = 0
+    previous: datetime | None = None
+    for end, st in enumerate(eligible):
+        if previous is not None and st - previous != _SLOT_DURATION:
+            run_start = end
+        previous = st
+        first = end - slots_needed + 1
+        if first >= run_start:
+            starts.append(first)
+    return starts
 
 
 def _rank_delay_interval_windows(
     request: ManualDeviceScheduleRequest,
-    slot_info: dict[datetime, _SlotInfo],
     eligible: list[datetime],
     slots_needed: int,
+    score: Callable[[int], tuple[float, float]],
     now: datetime,
 ) -> list[ManualDeviceWindow]:
     """
@@ -1774,31 +2330,27 @@ def _rank_delay_interval_windows(
     boundary for each delay and score that window.
     """
     windows: list[ManualDeviceWindow] = []
-    eligible_set = set(eligible)
-    last_eligible = eligible[-1] if eligible else now
+    window_span = _SLOT_DURATION * (slots_needed - 1)
 
-    for delay_h in sorted(request.delay_intervals_h or []):
+    for delay_h in request.delay_intervals_h or ():
         target_start = now + timedelta(hours=delay_h)
         # Snap to slot boundary
-        snapped = target_start.replace(
-            minute=(target_start.minute // SLOT_DURATION_MIN) * SLOT_DURATION_MIN,
-            second=0,
-            microsecond=0,
-        )
-        # Verify all required slots exist in the price data
-        window_slots = [
-            snapped + timedelta(minutes=SLOT_DURATION_MIN * k)
-            for k in range(slots_needed)
-        ]
-        if window_slots[-1] > last_eligible:
+        snapped = _get_current_slot_start(target_start)
+        # Verify all required slots exist in the price data.  Eligible slot
+        # starts are sorted and lie on the slot grid, so the window is
+        # complete when it starts at the snapped slot and the slot
+        # ``slots_needed - 1`` positions later is exactly one span away.
+        first = bisect_left(eligible, snapped)
+        last = first + slots_needed - 1
+        if (
+            last >= len(eligible)
+            or eligible[first] != snapped
+            or eligible[last] - snapped != window_span
+        ):
             continue  # Not enough price data for this delay
-        if not all(st in eligible_set for st in window_slots):
-            continue
 
-        total_cost, solar_fraction = _score_window(
-            window_slots, slot_info, request.peak_usage_w, request.avg_usage_w
-        )
-        end_time = window_slots[-1] + timedelta(minutes=SLOT_DURATION_MIN)
+        total_cost, solar_fraction = score(first)
+        end_time = eligible[last] + _SLOT_DURATION
 
         windows.append(
             ManualDeviceWindow(
@@ -1813,73 +2365,48 @@ def _rank_delay_interval_windows(
     return windows
 
 
-def _is_contiguous(slots: list[datetime]) -> bool:
-    """Check that slot start times form a contiguous sequence."""
-    for j in range(1, len(slots)):
-        if slots[j] - slots[j - 1] != timedelta(minutes=SLOT_DURATION_MIN):
-            return False
-    return True
-
-
-def _score_window(
-    window_slots: list[datetime],
-    slot_info: dict[datetime, _SlotInfo],
-    peak_usage_w: float,
-    avg_usage_w: float | None = None,
-) -> tuple[float, float]:
-    """Score a window — returns (total_cost, solar_fraction)."""
-    total_cost = 0.0
-    solar_count = 0
-    for st in window_slots:
-        slot = slot_info[st]
-        total_cost += _cost_for_device_in_slot(slot, avg_usage_w or peak_usage_w)
-        if slot.remaining_solar_w >= peak_usage_w:
-            solar_count += 1
-    solar_fraction = solar_count / len(window_slots) if window_slots else 0.0
-    return total_cost, solar_fraction
+def _parse_manual_device_data(data: Mapping[str, Any]) -> dict[str, Any]:
+    """Parse manual device subentry data into schedule request fields."""
+    # Parse delay intervals (e.g. "3,6,9" -> (3.0, 6.0, 9.0))
+    raw_intervals = data.get(CONF_DELAY_INTERVALS)
+    return {
+        "peak_usage_w": float(data[CONF_PEAK_USAGE]),
+        "avg_usage_w": float(data.get(CONF_AVG_USAGE, 0)) or None,
+        "cycle_duration_min": float(data[CONF_CYCLE_DURATION]),
+        "priority": int(data.get(CONF_PRIORITY, 5)),
+        "power_sensor": data.get(CONF_POWER_SENSOR),
+        "delay_intervals_h": (
+            _parse_delay_intervals(str(raw_intervals)) if raw_intervals else None
+        ),
+    }
 
 
 def _build_manual_device_requests(
     hass: HomeAssistant,
     entry: ConfigEntry,
+    coordinator: PriceCoordinator,
 ) -> list[ManualDeviceScheduleRequest]:
     """Build manual device schedule requests from subentries."""
     ent_reg = er.async_get(hass)
     requests = []
-    for subentry in entry.subentries.values():
-        if subentry.subentry_type != SUBENTRY_MANUAL_DEVICE:
-            continue
-        data = subentry.data
+    for subentry in _subentries_of_type(entry, coordinator, SUBENTRY_MANUAL_DEVICE):
+        params = _get_parsed_subentry_data(
+            coordinator, subentry, _parse_manual_device_data
+        )
+        request = ManualDeviceScheduleRequest(
+            subentry_id=subentry.subentry_id, name=subentry.title, **params
+        )
 
         # Read cycle duration from the number entity if available,
         # otherwise fall back to the config default.
-        config_duration = float(data[CONF_CYCLE_DURATION])
-        cycle_duration = _read_number_entity_value(
+        request.cycle_duration_min = _read_number_entity_value(
             hass,
             ent_reg,
             entry.entry_id,
             subentry.subentry_id,
-            config_duration,
-        )
-
-        # Parse delay intervals (e.g. "3,6,9" -> [3.0, 6.0, 9.0])
-        delay_intervals_h: list[float] | None = None
-        raw_intervals = data.get(CONF_DELAY_INTERVALS)
-        if raw_intervals:
-            delay_intervals_h = _parse_delay_intervals(str(raw_intervals))
-
-        requests.append(
-            ManualDeviceScheduleRequest(
-                subentry_id=subentry.subentry_id,
-                name=subentry.title,
-                peak_usage_w=float(data[CONF_PEAK_USAGE]),
-                avg_usage_w=float(data.get(CONF_AVG_USAGE, 0)) or None,
-                cycle_duration_min=cycle_duration,
-                priority=int(data.get(CONF_PRIORITY, 5)),
-                power_sensor=data.get(CONF_POWER_SENSOR),
-                delay_intervals_h=delay_intervals_h,
-            )
+            params["cycle_duration_min"],
         )
+        requests.append(request)
     return requests
 
 
@@ -1891,33 +2418,32 @@ def _read_number_entity_value(
     default: float,
 ) -> float:
     """Read the cycle duration number entity value, falling back to default."""
-    expected_uid = f"{entry_id}_{subentry_id}_manual_cycle_duration"
-    for ent_entry in ent_reg.entities.get_entries_for_config_entry_id(entry_id):
-        if ent_entry.unique_id == expected_uid:
-            state = hass.states.get(ent_entry.entity_id)
-            if state and state.state not in ("unknown", "unavailable"):
-                try:
-                    return float(state.state)
-                except (ValueError, TypeError):
-                    pass
-            break
-    return default
-
-
-def _parse_delay_intervals(raw: str) -> list[float] | None:
-    """Parse comma-separated delay hours string into a sorted list."""
-    parts = [p.strip() for p in raw.split(",") if p.strip()]
-    if not parts:
-        return None
+    entity_id = ent_reg.async_get_entity_id(
+        "number", DOMAIN, f"{entry_id}_{subentry_id}_manual_cycle_duration"
+    )
+    if entity_id is None:
+        return default
+    value = _try_float_state(hass.states.get(entity_id))
+    return value if value is not None else default
+
+
+@lru_cache(maxsize=64)
+def _parse_delay_intervals(raw: str) -> tuple[float, ...] | None:
+    """
+    Parse comma-separated delay hours string into a sorted tuple.
+
+    The setting rarely changes between scheduling cycles, so results are
+    memoized by the raw string.
+    """
     intervals: list[float] = []
-    for p in parts:
+    for part in raw.split(","):
         try:
-            val = float(p)
-            if val > 0:
-                intervals.append(val)
+            val = float(part)
         except ValueError:
             continue
-    return sorted(intervals) if intervals else None
+        if val > 0:
+            intervals.append(val)
+    return tuple(sorted(intervals)) or None
 
 
 def apply_reservations_to_slot_info(
@@ -1933,13 +2459,22 @@ def apply_reservations_to_slot_info(
     slots within the reservation window.
     """
     request_by_id = {r.subentry_id: r for r in manual_requests}
+
+    # Reservations do not depend on each other, so total the reserved power
+    # per slot first and deplete each slot once.
+    # slot_info is keyed chronologically, so the slots lying fully inside a
+    # reservation (start <= slot start, slot end <= end) are one slice.
+    slot_starts, _ = _ordered_slots(slot_info)
+    reserved_w: dict[datetime, float] = {}
     for subentry_id, (start, end) in reservations.items():
         req = request_by_id.get(subentry_id)
         if req is None:
             continue
-        for st, slot in slot_info.items():
-            slot_end = st + timedelta(minutes=SLOT_DURATION_MIN)
-            if st >= start and slot_end <= end:
-                slot.remaining_solar_w = max(
-                    0.0, slot.remaining_solar_w - req.peak_usage_w
-                )
+        first = bisect_left(slot_starts, start)
+        last = bisect_right(slot_starts, end - _SLOT_DURATION)
+        for st in slot_starts[first:last]:
+            reserved_w[st] = reserved_w.get(st, 0.0) + req.peak_usage_w
+
+    for st, power_w in reserved_w.items():
+        slot = slot_info[st]
+        slot.remaining_solar_w = max(0.0, slot.remaining_solar_w - power_w)
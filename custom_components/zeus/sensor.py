@@ -32,6 +32,7 @@ from .const import (
     CONF_PRODUCTION_ENTITY,
     CONF_SWITCH_ENTITY,
     DOMAIN,
+    MAX_RANKED_WINDOWS,
     SUBENTRY_HOME_MONITOR,
     SUBENTRY_MANUAL_DEVICE,
     SUBENTRY_SOLAR_INVERTER,
@@ -1091,8 +1092,6 @@ class ZeusThermostatRuntimeTodaySensor(
 # Manual device sensors
 # ---------------------------------------------------------------------------
 
-_MAX_RANKED_WINDOWS = 10
-
 
 class ZeusManualDeviceRecommendationSensor(
     CoordinatorEntity[PriceCoordinator], SensorEntity
@@ -1220,7 +1219,7 @@ class ZeusManualDeviceRecommendationSensor(
                             else {}
                         ),
                     }
-                    for w in ranking.windows[:_MAX_RANKED_WINDOWS]
+                    for w in ranking.windows[:MAX_RANKED_WINDOWS]
                 ]
             else:
                 attrs["estimated_cost"] = None
@@ -3,12 +3,23 @@
 from __future__ import annotations
 
 from datetime import datetime, time, timedelta, timezone
-
+from unittest.mock import MagicMock, patch
+
+from custom_components.zeus.const import (
+    CONF_AVG_USAGE,
+    CONF_CYCLE_DURATION,
+    CONF_DELAY_INTERVALS,
+    CONF_PEAK_USAGE,
+    MAX_RANKED_WINDOWS,
+    SUBENTRY_MANUAL_DEVICE,
+)
 from custom_components.zeus.coordinator import PriceSlot
 from custom_components.zeus.scheduler import (
     DeviceScheduleRequest,
     ManualDeviceScheduleRequest,
+    _build_manual_device_requests,
     _build_slot_info,
+    _ManualRankingCache,
     _parse_delay_intervals,
     _SlotInfo,
     apply_reservations_to_slot_info,
@@ -216,6 +227,28 @@ def test_reservation_depletes_solar():
     assert slot_info[base + timedelta(minutes=45)].remaining_solar_w == 3000.0
 
 
+def test_overlapping_reservations_deplete_combined_power():
+    """Overlapping reservations add up and never drive solar below zero."""
+    base = datetime(2026, 2, 11, 10, 0, tzinfo=TZ)
+
+    slot_info = _make_slot_info(base, [0.20] * 4, solar_w=[3000.0] * 4)
+
+    washer = _make_manual_request(subentry_id="washer", peak_usage_w=2000.0)
+    dryer = _make_manual_request(subentry_id="dryer", peak_usage_w=1500.0)
+    reservations = {
+        "washer": (base, base + timedelta(minutes=30)),
+        "dryer": (base + timedelta(minutes=15), base + timedelta(minutes=45)),
+    }
+
+    apply_reservations_to_slot_info(slot_info, reservations, [washer, dryer])
+
+    assert slot_info[base].remaining_solar_w == 1000.0
+    # Both reserved: 3000 - 2000 - 1500 clamps to zero
+    assert slot_info[base + timedelta(minutes=15)].remaining_solar_w == 0.0
+    assert slot_info[base + timedelta(minutes=30)].remaining_solar_w == 1500.0
+    assert slot_info[base + timedelta(minutes=45)].remaining_solar_w == 3000.0
+
+
 def test_reservation_expires():
     """Reservations in the past should not be returned by get_active_reservations."""
     # This is tested at the coordinator level; here we test the slot_info
@@ -424,12 +457,13 @@ def test_no_delay_intervals_uses_all_windows():
 
 def test_parse_delay_intervals():
     """Test the delay interval parsing helper."""
-    assert _parse_delay_intervals("3,6,9") == [3.0, 6.0, 9.0]
-    assert _parse_delay_intervals("9,3,6") == [3.0, 6.0, 9.0]  # sorted
+    assert _parse_delay_intervals("3,6,9") == (3.0, 6.0, 9.0)
+    assert _parse_delay_intervals("9,3,6") == (3.0, 6.0, 9.0)  # sorted
     assert _parse_delay_intervals("") is None
     assert _parse_delay_intervals("abc") is None
-    assert _parse_delay_intervals("1.5,3") == [1.5, 3.0]
-    assert _parse_delay_intervals("0,-1,2") == [2.0]  # zero and negative filtered
+    assert _parse_delay_intervals("1.5,3") == (1.5, 3.0)
+    assert _parse_delay_intervals(" 3 , ,6") == (3.0, 6.0)  # blanks skipped
+    assert _parse_delay_intervals("0,-1,2") == (2.0,)  # zero and negative filtered
 
 
 # ---------------------------------------------------------------------------
@@ -613,3 +647,129 @@ def test_ranking_at_6am_uses_next_day_cutoff():
     )
     for w in ranking.windows:
         assert w.start_time < cutoff
+
+
+def test_ranking_keeps_running_slot_and_drops_finished_slots():
+    """The slot in progress at now is eligible; slots already over are not."""
+    base = datetime(2026, 2, 11, 10, 0, tzinfo=TZ)
+    # 10:10 lies inside the 10:00 slot, after the 09:45 slot has ended
+    now = base + timedelta(minutes=10)
+
+    slot_info = _make_slot_info(base - timedelta(minutes=15), [0.01, 0.20, 0.30, 0.40])
+
+    request = _make_manual_request(cycle_duration_min=15.0)  # 1 slot
+    ranking = compute_manual_device_rankings(request, slot_info, now)
+
+    starts = [w.start_time for w in ranking.windows]
+    assert base - timedelta(minutes=15) not in starts
+    assert ranking.recommended_start == base
+
+
+def test_ranking_keeps_cheapest_windows_and_earliest():
+    """Only the cheapest windows are kept, plus the earliest-starting one."""
+    base = datetime(2026, 2, 11, 10, 0, tzinfo=TZ)
+    now = base
+
+    # Prices fall over time, so the earliest window is the most expensive
+    prices = [0.50 - 0.01 * i for i in range(24)]
+    slot_info = _make_slot_info(base, prices)
+
+    request = _make_manual_request(cycle_duration_min=30.0)  # 2 slots
+    ranking = compute_manual_device_rankings(request, slot_info, now)
+
+    assert len(ranking.windows) == MAX_RANKED_WINDOWS + 1
+    ranked = ranking.windows[:MAX_RANKED_WINDOWS]
+    for i in range(len(ranked) - 1):
+        assert ranked[i].total_cost <= ranked[i + 1].total_cost
+    assert ranking.recommended_start == base + timedelta(minutes=15 * 22)
+    assert ranking.windows[-1].start_time == base
+
+
+def test_rankings_share_cached_windows_and_sums():
+    """Devices with equal cycle lengths or usage reuse cached ranking data."""
+    base = datetime(2026, 2, 11, 10, 0, tzinfo=TZ)
+    now = base
+
+    prices = [0.30, 0.25, 0.10, 0.12, 0.28, 0.35]
+    slot_info = _make_slot_info(base, prices, solar_w=[0.0, 0.0, 1500.0] + [0.0] * 3)
+
+    small = _make_manual_request(
+        subentry_id="small", peak_usage_w=1000.0, cycle_duration_min=30.0
+    )
+    large = _make_manual_request(
+        subentry_id="large", peak_usage_w=2000.0, cycle_duration_min=30.0
+    )
+    large.avg_usage_w = 1000.0
+
+    cache = _ManualRankingCache()
+    shared = [
+        compute_manual_device_rankings(req, slot_info, now, None, cache)
+        for req in (small, large)
+    ]
+
+    assert list(cache.window_starts) == [2]
+    # Both devices draw 1000 W on average; their peaks differ
+    assert list(cache.cost_prefix_sums) == [1000.0]
+    assert list(cache.solar_prefix_sums) == [1000.0, 2000.0]
+    for req, ranking in zip((small, large), shared, strict=True):
+        assert ranking == compute_manual_device_rankings(req, slot_info, now)
+    # Solar coverage is still judged per device
+    assert shared[0].windows[0].solar_fraction == 0.5
+    assert shared[1].windows[0].solar_fraction == 0.0
+
+
+def test_equally_priced_windows_rank_chronologically():
+    """Windows with equal cost keep chronological order in the ranking."""
+    base = datetime(2026, 2, 11, 10, 0, tzinfo=TZ)
+    now = base
+
+    prices = [0.37, 0.11, 0.29] * 8
+    slot_info = _make_slot_info(base, prices)
+
+    # 3-slot windows all contain one slot of each price
+    request = _make_manual_request(cycle_duration_min=45.0)
+    ranking = compute_manual_device_rankings(request, slot_info, now)
+
+    starts = [w.start_time for w in ranking.windows]
+    assert starts == sorted(starts)
+    assert ranking.recommended_start == base
+
+
+def test_manual_requests_reuse_parsed_settings() -> None:
+    """Cached subentry settings survive the number entity override."""
+    subentry = MagicMock()
+    subentry.subentry_id = "manual_parse_test"
+    subentry.subentry_type = SUBENTRY_MANUAL_DEVICE
+    subentry.title = "Dishwasher"
+    subentry.data = {
+        CONF_PEAK_USAGE: "2000",
+        CONF_AVG_USAGE: 0,
+        CONF_CYCLE_DURATION: "90",
+        CONF_DELAY_INTERVALS: "6,3",
+    }
+    mock_entry = MagicMock()
+    mock_entry.entry_id = "manual_parse_entry"
+    mock_entry.subentries = {subentry.subentry_id: subentry}
+    coordinator = MagicMock()
+    coordinator.subentry_settings = {}
+    coordinator.subentries_by_type = None
+
+    number_state = MagicMock()
+    number_state.state = "120"
+    mock_hass = MagicMock()
+    mock_hass.states.get.return_value = number_state
+    ent_reg = MagicMock()
+    ent_reg.async_get_entity_id.return_value = "number.dishwasher_cycle"
+
+    with patch("custom_components.zeus.scheduler.er.async_get", return_value=ent_reg):
+        first = _build_manual_device_requests(mock_hass, mock_entry, coordinator)
+        mock_hass.states.get.return_value = None
+        second = _build_manual_device_requests(mock_hass, mock_entry, coordinator)
+
+    assert first[0].peak_usage_w == 2000.0
+    assert first[0].avg_usage_w is None
+    assert first[0].delay_intervals_h == (3.0, 6.0)
+    assert first[0].cycle_duration_min == 120.0
+    # Without a number state the configured duration is used again
+    assert second[0].cycle_duration_min == 90.0
+    assert coordinator.subentry_settings[subentry.subentry_id][0] is subentry.data
@@ -2,13 +2,27 @@
 
 from __future__ import annotations
 
-from datetime import datetime, time, timedelta, timezone
-from unittest.mock import MagicMock
+from datetime import UTC, datetime, time, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
 
+from homeassistant.util import dt as dt_util
+
+from custom_components.zeus.const import (
+    CONF_ENERGY_USAGE_ENTITY,
+    SUBENTRY_HOME_MONITOR,
+    SUBENTRY_SWITCH_DEVICE,
+)
 from custom_components.zeus.coordinator import PriceSlot
 from custom_components.zeus.scheduler import (
     DeviceScheduleRequest,
+    ThermostatScheduleRequest,
+    _build_device_requests,
+    _build_entry_index,
+    _get_home_consumption,
     _get_managed_device_draw,
+    _try_float_state,
+    async_get_runtime_today_minutes,
+    async_get_runtimes_today_minutes,
     compute_schedules,
 )
 
@@ -51,6 +65,14 @@ def _make_device(  # noqa: PLR0913
     )
 
 
+def _make_coordinator() -> MagicMock:
+    """Create a coordinator mock with empty scheduler caches."""
+    coordinator = MagicMock()
+    coordinator.subentry_settings = {}
+    coordinator.subentries_by_type = None
+    return coordinator
+
+
 def test_scheduler_picks_cheapest_slots() -> None:
     """Test that the scheduler assigns the cheapest slots first."""
     now = datetime(2026, 2, 9, 10, 0, 0, tzinfo=TZ)
@@ -666,6 +688,91 @@ def test_forecast_bias_correction_scales_future_slots() -> None:
     assert results_biased["b"].reason == "Scheduled: solar surplus available"
 
 
+def test_solar_forecast_matched_by_instant_across_timezones() -> None:
+    """Test that a UTC-keyed forecast hour lines up with local price slots."""
+    now = datetime(2026, 2, 9, 10, 0, 0, tzinfo=TZ)
+    slot_11 = datetime(2026, 2, 9, 11, 0, 0, tzinfo=TZ)
+    slots = [
+        PriceSlot(start_time=now, price=0.30, energy_price=0.24),
+        PriceSlot(start_time=slot_11, price=0.20, energy_price=0.16),
+    ]
+
+    # 09:00 UTC is the 10:00 local hour
+    solar_forecast = {now.astimezone(UTC).isoformat(): 3000}
+
+    device = _make_device(daily_runtime_min=15.0)
+    results, slot_info = compute_schedules([device], slots, solar_forecast, 0.0, now)
+
+    assert slot_info[now].solar_production_w == 3000.0
+    assert slot_info[slot_11].solar_production_w == 0.0
+    assert results["dev1"].scheduled_slots == [now]
+
+
+def test_solar_forecast_without_offset_read_as_local_time() -> None:
+    """Test that an offset-less forecast key matches the local slot."""
+    now = dt_util.as_local(datetime(2026, 2, 9, 10, 0, 0, tzinfo=UTC))
+    slots = [
+        PriceSlot(start_time=now, price=0.30, energy_price=0.24),
+        PriceSlot(start_time=now + timedelta(hours=1), price=0.20, energy_price=0.16),
+    ]
+
+    solar_forecast = {now.replace(tzinfo=None).isoformat(): 3000}
+
+    device = _make_device(daily_runtime_min=15.0)
+    _, slot_info = compute_schedules([device], slots, solar_forecast, 0.0, now)
+
+    assert slot_info[now].solar_production_w == 3000.0
+    assert slot_info[now + timedelta(hours=1)].solar_production_w == 0.0
+
+
+def test_parsed_solar_lookup_used_without_iso_forecast() -> None:
+    """A pre-parsed hour-start lookup feeds slot solar without ISO parsing."""
+    now = datetime(2026, 2, 9, 10, 0, 0, tzinfo=TZ)
+    slots = _make_slots(now, count=8)
+    device = _make_device(daily_runtime_min=15.0, peak_usage_w=1000.0)
+
+    results, slot_info = compute_schedules(
+        [device], slots, None, 0.0, now, solar_by_hour={now: 3000.0}
+    )
+
+    assert slot_info[now].solar_production_w == 3000.0
+    assert slot_info[now + timedelta(minutes=15)].solar_production_w == 3000.0
+    assert slot_info[now + timedelta(hours=1)].solar_production_w == 0.0
+    # Runs on solar within the forecast hour rather than on grid power later
+    assert results["dev1"].scheduled_slots[0] < now + timedelta(hours=1)
+
+
+def test_device_requests_reparse_after_reconfigure() -> None:
+    """Parsed subentry settings are reused until the subentry data changes."""
+    subentry = MagicMock()
+    subentry.subentry_id = "dev_reparse"
+    subentry.title = "Washer"
+    subentry.subentry_type = SUBENTRY_SWITCH_DEVICE
+    subentry.data = {
+        "switch_entity": "switch.washer",
+        "power_sensor": "sensor.washer_power",
+        "peak_usage": 2000,
+        "daily_runtime": 60,
+        "deadline": "07:30:00",
+    }
+    mock_entry = MagicMock()
+    mock_entry.subentries = {subentry.subentry_id: subentry}
+    coordinator = _make_coordinator()
+
+    first = _build_device_requests(mock_entry, coordinator)[0]
+    assert first.deadline == time(7, 30)
+    assert first.peak_usage_w == 2000.0
+
+    # Requests are fresh objects each tick even when settings are cached
+    first.runtime_today_min = 30.0
+    assert _build_device_requests(mock_entry, coordinator)[0].runtime_today_min == 0.0
+
+    subentry.data = {**subentry.data, "deadline": "18:00:00", "priority": 2}
+    updated = _build_device_requests(mock_entry, coordinator)[0]
+    assert updated.deadline == time(18, 0)
+    assert updated.priority == 2
+
+
 # -----------------------------------------------------------------------
 # use_actual_power toggle
 # -----------------------------------------------------------------------
@@ -802,13 +909,13 @@ def test_managed_device_draw_sums_active_devices() -> None:
     dev3.is_on = True
     dev3.actual_usage_w = 2500.0
 
-    # The function also reads thermostat entities from HA, but with a
-    # mock entry that has no subentries it will skip that part.
-    mock_hass = MagicMock()
+    # The function also reads thermostat entities from the state snapshot,
+    # but with a mock entry that has no subentries it will skip that part.
     mock_entry = MagicMock()
     mock_entry.subentries = {}
+    index = _build_entry_index(mock_entry, _make_coordinator())
 
-    total = _get_managed_device_draw(mock_hass, mock_entry, [dev1, dev2, dev3])
+    total = _get_managed_device_draw({}, index, [dev1, dev2, dev3])
     assert total == 4200.0  # 1700 + 0 (off) + 2500
 
 
@@ -818,9 +925,164 @@ def test_managed_device_draw_ignores_none_actual() -> None:
     dev.is_on = True
     dev.actual_usage_w = None
 
-    mock_hass = MagicMock()
     mock_entry = MagicMock()
     mock_entry.subentries = {}
+    index = _build_entry_index(mock_entry, _make_coordinator())
 
-    total = _get_managed_device_draw(mock_hass, mock_entry, [dev])
+    total = _get_managed_device_draw({}, index, [dev])
     assert total == 0.0
+
+
+def test_managed_device_draw_uses_populated_thermostats() -> None:
+    """Populated thermostat requests count toward managed draw when ON."""
+    heating = ThermostatScheduleRequest(
+        subentry_id="zone1",
+        name="Zone 1",
+        switch_entity="switch.zone1",
+        power_sensor="sensor.zone1_power",
+        temperature_sensor="sensor.zone1_temp",
+        peak_usage_w=800.0,
+        target_temp_low=19.0,
+        target_temp_high=21.0,
+        priority=5,
+        is_on=True,
+        actual_usage_w=650.0,
+    )
+    idle = ThermostatScheduleRequest(
+        subentry_id="zone2",
+        name="Zone 2",
+        switch_entity="switch.zone2",
+        power_sensor="sensor.zone2_power",
+        temperature_sensor="sensor.zone2_temp",
+        peak_usage_w=800.0,
+        target_temp_low=19.0,
+        target_temp_high=21.0,
+        priority=5,
+        is_on=False,
+        actual_usage_w=0.0,
+    )
+    dev = _make_device(subentry_id="boiler", peak_usage_w=1700.0)
+    dev.is_on = True
+    dev.actual_usage_w = 1500.0
+
+    # The entry index is not consulted when thermostats are passed in
+    mock_index = MagicMock()
+
+    total = _get_managed_device_draw({}, mock_index, [dev], [heating, idle])
+    assert total == 2150.0  # 1500 (boiler) + 650 (zone 1)
+
+
+def test_try_float_state_handles_missing_and_unavailable() -> None:
+    """Only parseable, available states yield a numeric reading."""
+    assert _try_float_state(None) is None
+    for raw in ("unknown", "unavailable", "n/a"):
+        state = MagicMock()
+        state.state = raw
+        assert _try_float_state(state) is None
+
+    state = MagicMock()
+    state.state = "1234.5"
+    assert _try_float_state(state) == 1234.5
+
+
+def test_home_consumption_follows_replaced_subentries() -> None:
+    """The coordinator's subentry partition follows replaced subentries."""
+
+    def _home_monitor(entity_id: str) -> MagicMock:
+        subentry = MagicMock()
+        subentry.subentry_type = SUBENTRY_HOME_MONITOR
+        subentry.data = {CONF_ENERGY_USAGE_ENTITY: entity_id}
+        return subentry
+
+    old_state = MagicMock()
+    old_state.state = "400"
+    new_state = MagicMock()
+    new_state.state = "900"
+    states = {"sensor.old_usage": old_state, "sensor.new_usage": new_state}
+
+    mock_entry = MagicMock()
+    mock_entry.subentries = {"home": _home_monitor("sensor.old_usage")}
+    coordinator = _make_coordinator()
+    index = _build_entry_index(mock_entry, coordinator)
+    assert _get_home_consumption(states, index) == 400.0
+
+    # Reconfiguring a subentry swaps in a new subentries mapping
+    mock_entry.subentries = {"home": _home_monitor("sensor.new_usage")}
+    index = _build_entry_index(mock_entry, coordinator)
+    assert _get_home_consumption(states, index) == 900.0
+
+
+async def test_runtime_today_skips_recorder_without_changes_today() -> None:
+    """An entity unchanged since midnight is answered from its current state."""
+    now = datetime(2026, 2, 9, 10, 30, tzinfo=UTC)
+    instance = MagicMock()
+    instance.async_add_executor_job = AsyncMock()
+
+    switch_state = MagicMock()
+    switch_state.last_changed = datetime(2026, 2, 8, 22, 0, tzinfo=UTC)
+    mock_hass = MagicMock()
+    mock_hass.states.get.return_value = switch_state
+
+    with (
+        patch("custom_components.zeus.scheduler.dt_util.now", return_value=now),
+        patch("custom_components.zeus.scheduler.get_instance", return_value=instance),
+    ):
+        switch_state.state = "off"
+        assert await async_get_runtime_today_minutes(mock_hass, "switch.x") == 0.0
+
+        switch_state.state = "on"
+        assert await async_get_runtime_today_minutes(mock_hass, "switch.x") == 630.0
+
+    instance.async_add_executor_job.assert_not_called()
+
+
+async def test_runtimes_today_use_one_recorder_query() -> None:
+    """Entities that switched today are fetched together in one query."""
+    now = datetime(2026, 2, 9, 10, 0, tzinfo=UTC)
+    midnight = datetime(2026, 2, 9, 0, 0, tzinfo=UTC)
+
+    def _state(value: str, changed: datetime) -> MagicMock:
+        state = MagicMock()
+        state.state = value
+        state.last_changed = changed
+        state.last_changed_timestamp = changed.timestamp()
+        return state
+
+    current = {
+        "switch.idle": _state("off", midnight - timedelta(hours=2)),
+        "switch.a": _state("off", midnight + timedelta(hours=2)),
+        "switch.b": _state("on", midnight + timedelta(hours=9)),
+    }
+    history_rows = {
+        "switch.a": [
+            _state("on", midnight + timedelta(hours=1)),
+            _state("off", midnight + timedelta(hours=2)),
+        ],
+        "switch.b": [
+            _state("off", midnight),
+            _state("on", midnight + timedelta(hours=9)),
+        ],
+    }
+    instance = MagicMock()
+    instance.async_add_executor_job = AsyncMock(
+        side_effect=lambda func, *args: func(*args)
+    )
+    mock_hass = MagicMock()
+
+    with (
+        patch("custom_components.zeus.scheduler.dt_util.now", return_value=now),
+        patch("custom_components.zeus.scheduler.dt_util.utcnow", return_value=now),
+        patch("custom_components.zeus.scheduler.get_instance", return_value=instance),
+        patch(
+            "custom_components.zeus.scheduler.history.get_significant_states",
+            return_value=history_rows,
+        ) as mock_query,
+    ):
+        runtimes = await async_get_runtimes_today_minutes(
+            mock_hass, current, ["switch.idle", "switch.a", "switch.b"]
+        )
+
+    assert runtimes == {"switch.idle": 0.0, "switch.a": 60.0, "switch.b": 60.0}
+    mock_hass.states.get.assert_not_called()
+    mock_query.assert_called_once()
+    assert mock_query.call_args.args[3] == ["switch.a", "switch.b"]
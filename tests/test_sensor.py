@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
 from datetime import timedelta
 from types import MappingProxyType
 from unittest.mock import AsyncMock, patch
 
 from homeassistant.config_entries import ConfigSubentry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, State
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers import entity_registry as er
 from homeassistant.util import dt as dt_util
@@ -80,6 +81,13 @@ def _patch_tibber_client(response: dict[str, TibberHome] | None = None):
     )
 
 
+def _no_runtime(
+    _hass: HomeAssistant, _states: Mapping[str, State | None], entity_ids: list[str]
+) -> dict[str, float]:
+    """Report zero runtime today for every switch entity."""
+    return dict.fromkeys(entity_ids, 0.0)
+
+
 def _entry_data() -> dict:
     """Return default entry data with access token."""
     return {
@@ -326,9 +334,9 @@ async def test_device_schedule_binary_sensor_created(
     with (
         _patch_tibber_client(),
         patch(
-            "custom_components.zeus.scheduler.async_get_runtime_today_minutes",
+            "custom_components.zeus.scheduler.async_get_runtimes_today_minutes",
             new_callable=AsyncMock,
-            return_value=0.0,
+            side_effect=_no_runtime,
         ),
     ):
         await hass.config_entries.async_setup(entry.entry_id)
@@ -424,9 +432,9 @@ async def test_device_schedule_sensor_links_to_existing_device(
     with (
         _patch_tibber_client(),
         patch(
-            "custom_components.zeus.scheduler.async_get_runtime_today_minutes",
+            "custom_components.zeus.scheduler.async_get_runtimes_today_minutes",
             new_callable=AsyncMock,
-            return_value=0.0,
+            side_effect=_no_runtime,
         ),
     ):
         await hass.config_entries.async_setup(entry.entry_id)
@@ -478,9 +486,9 @@ async def test_run_scheduler_service(
     with (
         _patch_tibber_client(),
         patch(
-            "custom_components.zeus.scheduler.async_get_runtime_today_minutes",
+            "custom_components.zeus.scheduler.async_get_runtimes_today_minutes",
             new_callable=AsyncMock,
-            return_value=0.0,
+            side_effect=_no_runtime,
         ),
     ):
         await hass.config_entries.async_setup(entry.entry_id)
@@ -491,9 +499,9 @@ async def test_run_scheduler_service(
 
     # Call the service
     with patch(
-        "custom_components.zeus.scheduler.async_get_runtime_today_minutes",
+        "custom_components.zeus.scheduler.async_get_runtimes_today_minutes",
         new_callable=AsyncMock,
-        return_value=0.0,
+        side_effect=_no_runtime,
     ):
         await hass.services.async_call(DOMAIN, "run_scheduler", blocking=True)
         await hass.async_block_till_done()
@@ -538,9 +546,9 @@ async def test_min_cycle_time_prevents_rapid_toggling(
     with (
         _patch_tibber_client(),
         patch(
-            "custom_components.zeus.scheduler.async_get_runtime_today_minutes",
+            "custom_components.zeus.scheduler.async_get_runtimes_today_minutes",
             new_callable=AsyncMock,
-            return_value=0.0,
+            side_effect=_no_runtime,
         ),
     ):
         await hass.config_entries.async_setup(entry.entry_id)
@@ -592,9 +600,9 @@ async def test_device_schedule_binary_sensor_has_min_cycle_time_default(
     with (
         _patch_tibber_client(),
         patch(
-            "custom_components.zeus.scheduler.async_get_runtime_today_minutes",
+            "custom_components.zeus.scheduler.async_get_runtimes_today_minutes",
             new_callable=AsyncMock,
-            return_value=0.0,
+            side_effect=_no_runtime,
         ),
     ):
         await hass.config_entries.async_setup(entry.entry_id)